@@ -1,11 +1,34 @@
 """
 Game class - Main game logic and loop
 """
+import re
 import time
 import curses
+import logging
 from player import Player
 from level import Level
 
+log = logging.getLogger(__name__)
+
+# Glyph bytes drawn into the framebuffer
+PLAYER_GLYPH = ord('@')
+PLATFORM_GLYPH = ord('=')
+OBSTACLE_GLYPH = ord('X')
+COIN_GLYPH = ord('o')
+
+# Runs of identical non-blank glyphs in a framebuffer row
+GLYPH_RUN = re.compile(rb'=+|X+|o+|@+')
+
+# Color pair used for each glyph byte
+GLYPH_COLORS = {
+    PLAYER_GLYPH: 1,
+    PLATFORM_GLYPH: 2,
+    OBSTACLE_GLYPH: 3,
+    COIN_GLYPH: 4,
+}
+
+CONTROLS_TEXT = "Controls: ←/a ↓/s →/d, ↑/w/SPACE=jump, q=quit"
+
 class Game:
     """
     Main game class handling the game loop, rendering and input
@@ -24,6 +47,18 @@ class Game:
         self.score = 0
         self.level_num = 1
         
+        # Off-screen pad each frame is composed on, and a framebuffer with one
+        # row per drawable line (the last line holds the controls)
+        self._pad = None
+        self._alloc_framebuffer()
+        
+        # Curses attributes for each glyph, looked up once instead of every frame
+        self._glyph_attrs = {glyph: curses.color_pair(pair) for glyph, pair in GLYPH_COLORS.items()}
+        
+        # Cached status line text and the (score, level) it was built for
+        self._status_key = None
+        self._status_text = ""
+        
         # Initialize player and level with safe initial position
         player_x = max(1, self.width // 4)
         player_y = max(1, self.height - 10)
@@ -31,159 +66,215 @@ class Game:
         
         # Initialize level
         self.level = Level(max(10, self.width), max(10, self.height))
-        self.level.generate_level(self.level_num)
-        
-        # Check if level loader returned a custom player position
-        if hasattr(self.level, 'player_pos') and self.level.player_pos is not None:
-            player_x, player_y = self.level.player_pos
-            self.player.x = player_x
-            self.player.y = player_y
+        self._load_level()
         
         # Set up input
-        stdscr.nodelay(True)  # Make getch non-blocking
+        stdscr.timeout(int(1000 * self.frame_time))  # getch blocks for at most one frame
         stdscr.keypad(True)   # Enable keypad mode for arrow keys
         
         # Game state
         self.state = "playing"  # "playing", "game_over", "win"
+        self._resize_pending = False  # Set when curses reports a terminal resize
+        
+        # Key code -> action tables
+        self._bind_keys()
 
-    def handle_input(self):
-        """Handle keyboard input"""
-        try:
-            key = self.stdscr.getch()
-            
-            if key == curses.KEY_LEFT or key == ord('a'):
-                self.player.move_left()
-            elif key == curses.KEY_RIGHT or key == ord('d'):
-                self.player.move_right()
-            elif key == curses.KEY_UP or key == ord('w') or key == ord(' '):
-                self.player.jump()
-            elif key == ord('q'):
-                self.running = False
-            elif key == ord('r') and (self.state == "game_over" or self.state == "win"):
-                self.reset_game()
-        except Exception:
-            # Handle any input errors gracefully
-            pass
+    def _bind_keys(self):
+        """Build the key dispatch tables for the current player"""
+        player = self.player
+        self._key_actions = {
+            curses.KEY_LEFT: player.move_left,
+            ord('a'): player.move_left,
+            curses.KEY_RIGHT: player.move_right,
+            ord('d'): player.move_right,
+            curses.KEY_UP: player.jump,
+            ord('w'): player.jump,
+            ord(' '): player.jump,
+            ord('q'): self.quit,
+            curses.KEY_RESIZE: self._request_resize,
+        }
+        # Only available on the game over and win screens
+        self._end_key_actions = {
+            ord('r'): self.reset_game,
+        }
+
+    def quit(self):
+        """Stop the game loop"""
+        self.running = False
+
+    def _request_resize(self):
+        """Handle the terminal resize on the next update"""
+        self._resize_pending = True
+
+    def handle_input(self, key):
+        """
+        Handle keyboard input
+        Args:
+            key: Key code returned by getch (-1 if no key was pressed)
+        """
+        action = self._key_actions.get(key)
+        if action is None and self.state != "playing":
+            action = self._end_key_actions.get(key)
+        if action is not None:
+            action()
 
     def update(self):
         """Update game state"""
+        # Handle a terminal resize reported through getch
+        if self._resize_pending:
+            self._resize_pending = False
+            new_height, new_width = self.stdscr.getmaxyx()
+            if new_height != self.height or new_width != self.width:
+                # Update dimensions regardless of size
+                self.height, self.width = new_height, new_width
+                # Always regenerate level on resize to ensure it fits
+                self.level.regenerate(self.width, self.height, self.level_num)
+                self._level_complete_pending = self.level.live_coins == 0
+                self._alloc_framebuffer()
+        
         # Apply gravity and update player position
         self.player.update(self.level)
         
-        # Check for collisions with collectibles
-        for coin in self.level.coins[:]:
-            if (abs(self.player.x - coin[0]) < 2 and 
-                abs(self.player.y - coin[1]) < 2):
-                self.level.coins.remove(coin)
-                self.score += 10
-        
-        # Check for collisions with obstacles
-        for obstacle in self.level.obstacles:
-            if (abs(self.player.x - obstacle[0]) < 2 and 
-                abs(self.player.y - obstacle[1]) < 2):
-                self.state = "game_over"
+        # Check for collisions with collectibles and obstacles
+        collected, hit_obstacle = self.level.collide(int(self.player.x), int(self.player.y))
+        self.score += 10 * collected
+        if collected and self.level.live_coins == 0:
+            self._level_complete_pending = True
+        if hit_obstacle:
+            self.state = "game_over"
         
         # Check if player has fallen off the bottom of the screen
         if self.player.y >= self.height - 1:
             self.state = "game_over"
         
-        # Check for level completion (all coins collected)
-        if not self.level.coins:
-            # Get the number of available levels
-            num_levels = len(self.level.level_files)
-            print(f"Level complete! Current level: {self.level_num}, Total levels: {num_levels}")
-            
-            if self.level_num < num_levels:
-                self.level_num += 1
-                print(f"Loading next level: {self.level_num}")
-                self.level.generate_level(self.level_num)
-            else:
-                print("All levels complete! Player wins!")
-                self.state = "win"
-        
-        # Check for screen resize
-        new_height, new_width = self.stdscr.getmaxyx()
-        if new_height != self.height or new_width != self.width:
-            # Update dimensions regardless of size
-            self.height, self.width = new_height, new_width
-            # Always regenerate level on resize to ensure it fits
-            self.level.regenerate(self.width, self.height, self.level_num)
+        # Move on once all coins have been collected
+        if self._level_complete_pending:
+            self._advance_level()
+
+    def _load_level(self):
+        """Load the current level and move the player to its start position"""
+        self.level.generate_level(self.level_num)
+        
+        # Check if level loader returned a custom player position
+        if self.level.player_pos is not None:
+            self.player.x, self.player.y = self.level.player_pos
+        
+        # A level without coins is complete as soon as it starts
+        self._level_complete_pending = self.level.live_coins == 0
+
+    def _advance_level(self):
+        """Load the next level, or win the game after the last one"""
+        self._level_complete_pending = False
+        log.debug("Level complete! Current level: %d, Total levels: %d", self.level_num, self.level.num_levels)
+        
+        if self.level_num < self.level.num_levels:
+            self.level_num += 1
+            log.debug("Loading next level: %d", self.level_num)
+            self._load_level()
+        else:
+            log.debug("All levels complete! Player wins!")
+            self.state = "win"
+
+    def _alloc_framebuffer(self):
+        """(Re)allocate the pad and framebuffer rows for the current screen size"""
+        pad_height, pad_width = max(1, self.height), max(1, self.width)
+        if self._pad is None:
+            self._pad = curses.newpad(pad_height, pad_width)
+        else:
+            self._pad.resize(pad_height, pad_width)
+        
+        row_width = max(0, self.width - 1)
+        self._rowbuf = [bytearray(b' ' * row_width) for _ in range(max(0, self.height - 1))]
+        self._blank_row = b' ' * row_width
+        self._platform_row = bytes([PLATFORM_GLYPH]) * row_width
+        self._clipped_generation = None  # Forces the platforms to be clipped to the new size
+
+    def _clip_platforms(self):
+        """Clip the level's platform spans to the framebuffer"""
+        row_width = len(self._blank_row)
+        num_rows = len(self._rowbuf)
+        spans = []
+        for y, row in self.level.platforms_by_row.items():
+            if 0 <= y < num_rows:
+                for x, width in row:
+                    x0, x1 = max(0, x), min(row_width, x + width)
+                    if x1 > x0:
+                        spans.append((y, x0, x1 - x0))
+        self._platform_spans = spans
+        self._clipped_generation = self.level.generation
 
     def render(self):
         """Render the game state to the terminal"""
+        pad = self._pad
         try:
-            self.stdscr.clear()
+            # erase() rather than clear(), so curses only sends the cells that changed
+            pad.erase()
             
             # Always render, even for small terminals - we'll just make our best effort
             # If the terminal is very small, we'll just show as much as we can
             
-            # Draw platforms
-            for platform in self.level.platforms:
-                x, y, width = platform
-                for i in range(width):
-                    if 0 <= x + i < self.width - 1 and 0 <= y < self.height - 1:
-                        try:
-                            self.stdscr.addch(int(y), int(x + i), '=', curses.color_pair(2))
-                        except:
-                            # Silently ignore any errors when drawing
-                            pass
+            # Clear the framebuffer
+            rows = self._rowbuf
+            row_width = len(self._blank_row)
+            num_rows = len(rows)
+            platform_row = self._platform_row
+            glyph_attrs = self._glyph_attrs
+            addstr = pad.addstr
+            for buf in rows:
+                buf[:] = self._blank_row
+            
+            # Draw platforms, clipped to the screen once per level layout or resize
+            if self._clipped_generation != self.level.generation:
+                self._clip_platforms()
+            for y, x, width in self._platform_spans:
+                rows[y][x:x + width] = platform_row[:width]
             
             # Draw obstacles
-            for obstacle in self.level.obstacles:
-                x, y = obstacle
-                if 0 <= x < self.width - 1 and 0 <= y < self.height - 1:
-                    try:
-                        self.stdscr.addch(int(y), int(x), 'X', curses.color_pair(3))
-                    except:
-                        pass
+            for x, y in self.level.obstacles:
+                if 0 <= x < row_width and 0 <= y < num_rows:
+                    rows[y][x] = OBSTACLE_GLYPH
             
             # Draw coins
-            for coin in self.level.coins:
-                x, y = coin
-                if 0 <= x < self.width - 1 and 0 <= y < self.height - 1:
+            for (x, y), alive in zip(self.level.coins, self.level.coin_alive):
+                if alive and 0 <= x < row_width and 0 <= y < num_rows:
+                    rows[y][x] = COIN_GLYPH
+            
+            # Draw player
+            if 0 <= self.player.x < row_width and 0 <= self.player.y < num_rows:
+                rows[int(self.player.y)][int(self.player.x)] = PLAYER_GLYPH
+            
+            # Blit the framebuffer, one addstr per run of same-colored glyphs
+            for y, buf in enumerate(rows):
+                for run in GLYPH_RUN.finditer(buf):
+                    start = run.start()
                     try:
-                        self.stdscr.addch(int(y), int(x), 'o', curses.color_pair(4))
-                    except:
+                        addstr(y, start, run.group(), glyph_attrs[buf[start]])
+                    except curses.error:
                         pass
             
-            # Draw player
-            if 0 <= self.player.x < self.width - 1 and 0 <= self.player.y < self.height - 1:
-                try:
-                    self.stdscr.addch(int(self.player.y), int(self.player.x), '@', curses.color_pair(1))
-                except:
-                    pass
+            # Draw score and level info, rebuilding the text only when it changes
+            status_key = (self.score, self.level_num)
+            if status_key != self._status_key:
+                self._status_key = status_key
+                self._status_text = f"Score: {self.score}  Level: {self.level_num}/{self.level.num_levels}"
+            try:
+                pad.addstr(0, 0, self._status_text[:self.width - 1])
+            except curses.error:
+                pass
             
-            # Draw score and level info
-            score_text = f"Score: {self.score}"
-            if len(score_text) < self.width:
-                try:
-                    self.stdscr.addstr(0, 0, score_text)
-                except:
-                    pass
-                    
-            # Show current level information
-            level_text = f"Level: {self.level_num}/{len(self.level.level_files)}"
-            if len(level_text) < self.width:
+            # Draw controls if playing
+            if self.state == "playing" and len(CONTROLS_TEXT) < self.width:
                 try:
-                    self.stdscr.addstr(0, len(score_text) + 2, level_text)
-                except:
+                    pad.addstr(self.height - 1, 0, CONTROLS_TEXT)
+                except curses.error:
                     pass
             
-            # Draw controls if playing
-            if self.state == "playing":
-                controls = "Controls: ←/a ↓/s →/d, ↑/w/SPACE=jump, q=quit"
-                if len(controls) < self.width:
-                    try:
-                        self.stdscr.addstr(self.height - 1, 0, controls)
-                    except:
-                        pass
-            
             # Draw game over or win screen
             if self.state == "game_over":
                 game_over_text = "GAME OVER! Press 'r' to restart or 'q' to quit"
                 if len(game_over_text) < self.width and self.height > 5:
                     try:
-                        self.stdscr.addstr(self.height // 2, max(0, (self.width - len(game_over_text)) // 2), 
+                        pad.addstr(self.height // 2, max(0, (self.width - len(game_over_text)) // 2), 
                                           game_over_text, curses.A_BOLD)
                     except:
                         pass
@@ -192,19 +283,21 @@ class Game:
                 win_text = f"YOU WIN! Final Score: {self.score} - Press 'r' to restart or 'q' to quit"
                 if len(win_text) < self.width and self.height > 5:
                     try:
-                        self.stdscr.addstr(self.height // 2, max(0, (self.width - len(win_text)) // 2), 
+                        pad.addstr(self.height // 2, max(0, (self.width - len(win_text)) // 2), 
                                           win_text, curses.A_BOLD)
                     except:
                         pass
             
-            self.stdscr.refresh()
+            pad.noutrefresh(0, 0, 0, 0, self.height - 1, self.width - 1)
+            curses.doupdate()
         except Exception as e:
             # Catch any rendering errors and try to recover
             try:
-                self.stdscr.clear()
+                pad.erase()
                 if self.width > 20 and self.height > 3:
-                    self.stdscr.addstr(0, 0, "Rendering error")
-                self.stdscr.refresh()
+                    pad.addstr(0, 0, "Rendering error")
+                pad.noutrefresh(0, 0, 0, 0, self.height - 1, self.width - 1)
+                curses.doupdate()
             except:
                 pass
 
@@ -219,34 +312,32 @@ class Game:
         self.player = Player(player_x, player_y)
         
         # Regenerate level
-        self.level.generate_level(self.level_num)
+        self._load_level()
         
-        # Check if level loader returned a custom player position
-        if hasattr(self.level, 'player_pos') and self.level.player_pos is not None:
-            player_x, player_y = self.level.player_pos
-            self.player.x = player_x
-            self.player.y = player_y
-            
         self.state = "playing"
+        self._bind_keys()
 
     def run(self):
         """Main game loop"""
-        last_frame_time = time.time()
+        next_frame = time.monotonic()
         
         while self.running:
-            # Calculate elapsed time
-            current_time = time.time()
-            delta_time = current_time - last_frame_time
+            # Block waiting for input until the next frame is due
+            wait_ms = int((next_frame - time.monotonic()) * 1000)
+            self.stdscr.timeout(max(0, wait_ms))
+            self.handle_input(self.stdscr.getch())
+            
+            current_time = time.monotonic()
+            if current_time < next_frame:
+                continue
             
-            # Handle input
-            self.handle_input()
+            # If we fell far behind (e.g. the process was suspended), resync instead of catching up
+            if current_time - next_frame > 5 * self.frame_time:
+                next_frame = current_time
             
-            # Update game state if it's time for a new frame
-            if delta_time >= self.frame_time:
+            # Catch up on any missed updates, but only render the latest state
+            while next_frame <= current_time:
                 if self.state == "playing":
                     self.update()
-                self.render()
-                last_frame_time = current_time
-            
-            # Sleep to reduce CPU usage
-            time.sleep(0.01)
\ No newline at end of file
+                next_frame += self.frame_time
+            self.render()
@@ -2,7 +2,13 @@
 Level class - Handle level loading and management
 """
 import os
-from level_loader import LevelLoader
+import logging
+from level_loader import LevelLoader, Platform
+
+log = logging.getLogger(__name__)
+
+# Collision grid cells are 2x2 tiles, matching the pickup/hit distance
+GRID_SHIFT = 1
 
 
 class Level:
@@ -19,12 +25,20 @@ class Level:
         """
         self.width = max(10, width)
         self.height = max(10, height)
-        self.platforms = []  # List of (x, y, width) tuples
+        self.platforms = []  # List of Platform(x, y, width) tuples
         self.obstacles = []  # List of (x, y) tuples
         self.coins = []      # List of (x, y) tuples
+        self.coin_alive = bytearray()  # 1 for each coin that has not been collected yet
+        self.live_coins = 0            # Number of coins left to collect
+        self.platforms_by_row = {}  # y -> sorted, non-overlapping list of (x, width) spans
+        self.platform_columns = {}  # y -> bytearray with a 1 for each column covered by a platform
+        self.coin_grid = {}      # (cell_x, cell_y) -> indices of coins in that cell
+        self.obstacle_grid = {}  # (cell_x, cell_y) -> indices of obstacles in that cell
+        self.generation = 0      # Bumped every time the indices above are rebuilt
         self.player_pos = None  # Default player position (x, y)
         self.loader = LevelLoader()
         self.level_files = self.loader.get_level_list()
+        self.num_levels = len(self.level_files)
         self.current_level_idx = 0
         
     def generate_level(self, level_num):
@@ -34,26 +48,23 @@ class Level:
         Args:
             level_num: Level number (used to select from available level files)
         """
-        self.platforms = []
-        self.obstacles = []
-        self.coins = []
-        
         # Check if we have level files
         if self.level_files:
             # Determine which level file to load
-            idx = (level_num - 1) % len(self.level_files)
+            idx = (level_num - 1) % self.num_levels
             self.current_level_idx = idx
             
-            print(f"Loading level {level_num} from file: {self.level_files[idx]}")
-            print(f"Available level files: {len(self.level_files)}")
+            log.debug("Loading level %d from file: %s", level_num, self.level_files[idx])
+            log.debug("Available level files: %d", self.num_levels)
             
             try:
                 # Load the level data
                 platforms, obstacles, coins, player_pos, level_width, level_height = self.loader.load_level(self.level_files[idx])
                 
                 # Log level information for debugging
-                print(f"Level loaded - Platforms: {len(platforms)}, Obstacles: {len(obstacles)}, Coins: {len(coins)}")
-                print(f"Level dimensions: {level_width}x{level_height}, Player position: {player_pos}")
+                log.debug("Level loaded - Platforms: %d, Obstacles: %d, Coins: %d",
+                          len(platforms), len(obstacles), len(coins))
+                log.debug("Level dimensions: %dx%d, Player position: %s", level_width, level_height, player_pos)
                 
                 # Store the level data
                 self.platforms = platforms
@@ -65,24 +76,26 @@ class Level:
                 if level_width > self.width or level_height > self.height:
                     self._scale_level_elements(level_width, level_height)
                     
+                self._build_indices()
                 return
             except Exception as e:
-                print(f"Error loading level: {str(e)}")
+                log.warning("Error loading level: %s", e)
                 # Fall back to default level if loading fails
         
         # If no level files or loading failed, create a simple default level
         self._create_default_level()
+        self._build_indices()
         
     def _create_default_level(self):
         """Create a simple default level when no level files are available"""
-        # Clear existing elements
-        self.platforms = []
-        self.obstacles = []
-        self.coins = []
+        # Clear existing elements, reusing the lists
+        self.platforms.clear()
+        self.obstacles.clear()
+        self.coins.clear()
         
         # Add ground platform
         ground_y = max(3, self.height - 5)
-        self.platforms.append((0, ground_y, self.width))
+        self.platforms.append(Platform(0, ground_y, self.width))
         
         # Add a few platforms
         if self.height > 10 and self.width > 15:
@@ -92,12 +105,12 @@ class Level:
             # Platform 1
             platform_width1 = min(10, self.width // 3)
             platform_x1 = self.width // 4
-            self.platforms.append((platform_x1, platform_y1, platform_width1))
+            self.platforms.append(Platform(platform_x1, platform_y1, platform_width1))
             
             # Platform 2
             platform_width2 = min(8, self.width // 4)
             platform_x2 = (self.width // 2) + 2
-            self.platforms.append((platform_x2, platform_y2, platform_width2))
+            self.platforms.append(Platform(platform_x2, platform_y2, platform_width2))
             
             # Add coins
             self.coins.append((platform_x1 + 1, platform_y1 - 1))
@@ -126,32 +139,131 @@ class Level:
         height_ratio = self.height / original_height
         
         # Scale platforms
-        scaled_platforms = []
-        for x, y, width in self.platforms:
-            new_x = int(x * width_ratio)
-            new_y = int(y * height_ratio)
-            new_width = max(1, int(width * width_ratio))
-            scaled_platforms.append((new_x, new_y, new_width))
-        self.platforms = scaled_platforms
-        
-        # Scale obstacles
-        scaled_obstacles = []
-        for x, y in self.obstacles:
-            new_x = int(x * width_ratio)
-            new_y = int(y * height_ratio)
-            if 0 <= new_x < self.width and 0 <= new_y < self.height:
-                scaled_obstacles.append((new_x, new_y))
-        self.obstacles = scaled_obstacles
-        
-        # Scale coins
-        scaled_coins = []
-        for x, y in self.coins:
-            new_x = int(x * width_ratio)
-            new_y = int(y * height_ratio)
-            if 0 <= new_x < self.width and 0 <= new_y < self.height:
-                scaled_coins.append((new_x, new_y))
-        self.coins = scaled_coins
+        self.platforms = [
+            Platform(int(x * width_ratio), int(y * height_ratio), max(1, int(width * width_ratio)))
+            for x, y, width in self.platforms
+        ]
+        
+        # Scale obstacles and coins, dropping any that end up off screen
+        self.obstacles = self._scale_points(self.obstacles, width_ratio, height_ratio)
+        self.coins = self._scale_points(self.coins, width_ratio, height_ratio)
+
+    def _scale_points(self, points, width_ratio, height_ratio):
+        """
+        Scale a list of points, keeping only those that stay on screen
+        
+        Args:
+            points: List of (x, y) tuples
+            width_ratio: Horizontal scale factor
+            height_ratio: Vertical scale factor
+            
+        Returns:
+            list: Scaled (x, y) tuples
+        """
+        width, height = self.width, self.height
+        scaled = ((int(x * width_ratio), int(y * height_ratio)) for x, y in points)
+        return [(x, y) for x, y in scaled if 0 <= x < width and 0 <= y < height]
+
+    def _build_indices(self):
+        """
+        Index platforms by row and bucket coins and obstacles by grid cell.
+        The existing containers are refilled in place rather than reallocated.
+        """
+        self._build_platform_rows()
+        self.coin_alive[:] = b'\x01' * len(self.coins)
+        self.live_coins = len(self.coins)
+        self._fill_grid(self.coin_grid, self.coins)
+        self._fill_grid(self.obstacle_grid, self.obstacles)
+        self.generation += 1
+
+    def _build_platform_rows(self):
+        """Group platforms by row, merging any that overlap, and mask the columns they cover"""
+        rows = self.platforms_by_row
+        rows.clear()
+        for x, y, width in sorted(self.platforms, key=lambda p: (p.y, p.x)):
+            spans = rows.setdefault(y, [])
+            if spans and x <= spans[-1][0] + spans[-1][1]:
+                # Overlaps or touches the previous span, so extend it
+                start, prev_width = spans[-1]
+                spans[-1] = (start, max(prev_width, x + width - start))
+            else:
+                spans.append((x, width))
+        
+        # Column masks, so checking for a platform is a single index. Platforms
+        # never start left of column 0: the loader reads them from unsigned
+        # columns and the default and scaled layouts only use non-negative x.
+        self.platform_columns.clear()
+        for y, spans in rows.items():
+            start, width = spans[-1]
+            columns = bytearray(start + width)
+            for x, width in spans:
+                assert x >= 0, f"platform starts left of column 0: x={x}, y={y}"
+                columns[x:x + width] = b'\x01' * width
+            self.platform_columns[y] = columns
+
+    @staticmethod
+    def _fill_grid(grid, points):
+        """
+        Refill a spatial hash of points
         
+        Args:
+            grid: Dict to fill with (cell_x, cell_y) -> indices of the points in that cell
+            points: List of (x, y) tuples with integer coordinates
+        """
+        grid.clear()
+        for i, (x, y) in enumerate(points):
+            grid.setdefault((x >> GRID_SHIFT, y >> GRID_SHIFT), []).append(i)
+
+    @staticmethod
+    def _near(grid, x, y):
+        """
+        Get the points in the grid cells covering one tile around (x, y)
+        
+        Args:
+            grid: Spatial hash filled by _fill_grid
+            x: Integer x position
+            y: Integer y position
+            
+        Returns:
+            list: Indices of the candidate points
+        """
+        found = []
+        for cell_y in range((y - 1) >> GRID_SHIFT, ((y + 1) >> GRID_SHIFT) + 1):
+            for cell_x in range((x - 1) >> GRID_SHIFT, ((x + 1) >> GRID_SHIFT) + 1):
+                found.extend(grid.get((cell_x, cell_y), ()))
+        return found
+
+    def collide(self, x, y):
+        """
+        Collect the coins and find the obstacles within one tile of a position
+        
+        Args:
+            x: Integer x position
+            y: Integer y position
+            
+        Returns:
+            tuple: (number of coins collected, True if an obstacle was hit)
+        """
+        coins, alive = self.coins, self.coin_alive
+        collected = 0
+        for i in self._near(self.coin_grid, x, y):
+            if alive[i]:
+                coin_x, coin_y = coins[i]
+                if -1 <= x - coin_x <= 1 and -1 <= y - coin_y <= 1:
+                    alive[i] = 0
+                    collected += 1
+        self.live_coins -= collected
+        
+        obstacles = self.obstacles
+        hit = False
+        for i in self._near(self.obstacle_grid, x, y):
+            obstacle_x, obstacle_y = obstacles[i]
+            if -1 <= x - obstacle_x <= 1 and -1 <= y - obstacle_y <= 1:
+                hit = True
+                break
+        
+        return collected, hit
+
     def regenerate(self, new_width, new_height, level_num):
         """
         Regenerate the level with new dimensions
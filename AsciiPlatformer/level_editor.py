@@ -2,11 +2,26 @@
 Level Editor - Create and edit level files for ASCII Platformer
 """
 import os
+import re
 import curses
-import time
+from itertools import groupby
 from level_loader import LevelLoader
 
 
+# Color pair used for each grid byte (anything else uses pair 0), as a
+# bytes.translate table so a whole row maps to its color pairs at once
+CHAR_COLORS = bytearray(256)
+CHAR_COLORS[ord('P')] = 1  # Player
+CHAR_COLORS[ord('=')] = 2  # Platform
+CHAR_COLORS[ord('X')] = 3  # Obstacle
+CHAR_COLORS[ord('o')] = 4  # Coin
+CHAR_COLORS = bytes(CHAR_COLORS)
+
+# Runs of platform cells and single-cell elements in the grid
+PLATFORM_RUN = re.compile(rb'=+')
+ELEMENT = re.compile(rb'[Xo]')
+
+
 class LevelEditor:
     """
     Simple level editor for creating ASCII Platformer levels
@@ -33,17 +48,15 @@ class LevelEditor:
         curses.init_pair(4, curses.COLOR_YELLOW, curses.COLOR_BLACK) # Coin
         curses.init_pair(5, curses.COLOR_WHITE, curses.COLOR_BLACK)  # UI Text
         
-        # Initialize grid and editor state
+        # Curses attributes for each color pair, looked up once
+        self._pairs = tuple(curses.color_pair(i) for i in range(6))
+        
+        # Initialize grid and editor state. The grid is a flat row-major
+        # bytearray, cell (x, y) is at index y * level_width + x. The position
+        # of its single 'P' cell is kept in player_pos (None if there is none).
         self.level_width = min(40, self.width - 2)
         self.level_height = min(20, self.height - 2)
-        self.grid = [[' ' for _ in range(self.level_width)] for _ in range(self.level_height)]
-        
-        # Add ground at the bottom
-        for x in range(self.level_width):
-            self.grid[self.level_height - 1][x] = '='
-            
-        # Set player position
-        self.grid[self.level_height - 2][1] = 'P'
+        self._new_grid()
         
         # Editor state
         self.current_tool = '='  # Default tool (platform)
@@ -53,47 +66,83 @@ class LevelEditor:
         self.current_file = None
         self.message = "Welcome to Level Editor! Press 'h' for help."
         
+        # What is currently on screen, so render only redraws what changed.
+        # Setting prev_grid to None forces a full redraw.
+        self.prev_grid = None
+        self._prev_ui_key = None    # Editor state the UI lines were last built from
+        self._prev_ui_lines = None  # UI lines currently on screen
+        
+        # Key code -> action tables
+        self._bind_keys()
+        
+    def _new_grid(self):
+        """Create a blank grid with ground at the bottom and the player above it"""
+        width, height = self.level_width, self.level_height
+        self.grid = bytearray(b' ' * (width * height))
+        
+        # Add ground at the bottom
+        self.grid[(height - 1) * width:] = b'=' * width
+        
+        # Set player position
+        self.player_pos = (1, height - 2)
+        self.grid[(height - 2) * width + 1] = ord('P')
+
+    def _clamp_cursor(self):
+        """Keep the cursor inside the grid after the level size changes"""
+        self.cursor_x = min(self.cursor_x, self.level_width - 1)
+        self.cursor_y = min(self.cursor_y, self.level_height - 1)
+
     def render(self):
-        """Render the level editor UI"""
-        self.stdscr.clear()
+        """Render the level editor UI, redrawing only what changed since the last call"""
+        if self.prev_grid is None:
+            self.stdscr.clear()
+            self.prev_grid = [None] * self.level_height
+            self._prev_ui_key = None
+            self._prev_ui_lines = (None, None, None)
         
-        # Draw the grid
+        # Draw the grid rows that changed, one addstr per run of cells sharing a color
+        width = self.level_width
+        pairs = self._pairs
         for y in range(self.level_height):
-            for x in range(self.level_width):
-                char = self.grid[y][x]
-                color_pair = 0
-                
-                if char == 'P':
-                    color_pair = 1
-                elif char == '=':
-                    color_pair = 2
-                elif char == 'X':
-                    color_pair = 3
-                elif char == 'o':
-                    color_pair = 4
-                
+            row = bytes(self.grid[y * width:(y + 1) * width])
+            if row == self.prev_grid[y]:
+                continue
+            self.prev_grid[y] = row
+            
+            x = 0
+            for color_pair, run in groupby(row.translate(CHAR_COLORS)):
+                run_length = len(bytes(run))
                 try:
-                    self.stdscr.addch(y + 1, x + 1, char, curses.color_pair(color_pair))
-                except:
+                    self.stdscr.addstr(y + 1, x + 1, row[x:x + run_length], pairs[color_pair])
+                except curses.error:
                     pass
+                x += run_length
                 
-        # Draw UI elements
-        if self.height > self.level_height + 2:
+        # Draw UI elements, only formatting them when the state they show changed
+        ui_key = (self.current_tool, self.cursor_x, self.cursor_y, self.level_width, self.level_height,
+                  self.current_file, self.message)
+        if self.height > self.level_height + 2 and ui_key != self._prev_ui_key:
+            self._prev_ui_key = ui_key
+            
             status_line = f"Tool: {self.current_tool} | "
             status_line += f"Cursor: ({self.cursor_x}, {self.cursor_y}) | "
             status_line += f"Size: {self.level_width}x{self.level_height}"
             
+            if self.current_file:
+                file_line = f"Current file: {self.current_file}"
+            else:
+                file_line = "No file loaded/saved"
+            
+            # Redraw just the lines whose text changed
+            ui_lines = (status_line, file_line, self.message)
             try:
-                self.stdscr.addstr(self.level_height + 2, 1, status_line, curses.color_pair(5))
-                
-                if self.current_file:
-                    self.stdscr.addstr(self.level_height + 3, 1, f"Current file: {self.current_file}", curses.color_pair(5))
-                else:
-                    self.stdscr.addstr(self.level_height + 3, 1, "No file loaded/saved", curses.color_pair(5))
-                    
-                self.stdscr.addstr(self.level_height + 4, 1, self.message, curses.color_pair(5))
-            except:
+                for i, (line, prev_line) in enumerate(zip(ui_lines, self._prev_ui_lines)):
+                    if line != prev_line:
+                        self.stdscr.addstr(self.level_height + 2 + i, 1, line, self._pairs[5])
+                        self.stdscr.clrtoeol()  # Clear what is left of a longer previous line
+            except curses.error:
                 pass
+            self._prev_ui_lines = ui_lines
                 
         # Draw cursor
         try:
@@ -103,8 +152,55 @@ class LevelEditor:
             
         self.stdscr.refresh()
         
+    def _bind_keys(self):
+        """Build the key dispatch tables"""
+        # Key -> (tool, message shown when it is selected)
+        self._key_tools = {
+            ord('p'): ('P', "Selected: Player start position"),
+            ord('='): ('=', "Selected: Platform"),
+            ord('x'): ('X', "Selected: Obstacle"),
+            ord('o'): ('o', "Selected: Coin"),
+            ord(' '): (' ', "Selected: Eraser"),
+        }
+        self._key_actions = {
+            10: self.place_tool,  # Enter key
+            ord('s'): self.save_level,
+            ord('l'): self.load_level,
+            ord('n'): self.new_level,
+            ord('q'): self.quit,
+            ord('h'): self.show_help,
+            curses.KEY_RESIZE: self._handle_resize,
+        }
+
+    def quit(self):
+        """Stop the editor loop"""
+        self.running = False
+
+    def _handle_resize(self):
+        """Pick up the new terminal size and redraw everything"""
+        self.height, self.width = self.stdscr.getmaxyx()
+        self.prev_grid = None
+
+    def place_tool(self):
+        """Place the current tool at the cursor position"""
+        # If this is the player position, remove any existing player marker
+        if self.current_tool == 'P':
+            if self.player_pos is not None:
+                px, py = self.player_pos
+                self.grid[py * self.level_width + px] = ord(' ')
+            self.player_pos = (self.cursor_x, self.cursor_y)
+        elif (self.cursor_x, self.cursor_y) == self.player_pos:
+            self.player_pos = None  # The player marker is being overwritten
+        
+        self.grid[self.cursor_y * self.level_width + self.cursor_x] = ord(self.current_tool)
+
     def handle_input(self):
-        """Handle keyboard input"""
+        """
+        Wait for a key press and handle it
+        
+        Returns:
+            bool: True if the key was handled and the screen may need redrawing
+        """
         try:
             key = self.stdscr.getch()
             
@@ -119,104 +215,67 @@ class LevelEditor:
                 self.cursor_x = min(self.level_width - 1, self.cursor_x + 1)
             
             # Tool selection
-            elif key == ord('p'):
-                self.current_tool = 'P'
-                self.message = "Selected: Player start position"
-            elif key == ord('='):
-                self.current_tool = '='
-                self.message = "Selected: Platform"
-            elif key == ord('x'):
-                self.current_tool = 'X'
-                self.message = "Selected: Obstacle"
-            elif key == ord('o'):
-                self.current_tool = 'o'
-                self.message = "Selected: Coin"
-            elif key == ord(' '):
-                self.current_tool = ' '
-                self.message = "Selected: Eraser"
-                
-            # Place the current tool at cursor position
-            elif key == 10:  # Enter key
-                # If this is the player position, remove any existing player marker
-                if self.current_tool == 'P':
-                    for y in range(self.level_height):
-                        for x in range(self.level_width):
-                            if self.grid[y][x] == 'P':
-                                self.grid[y][x] = ' '
-                                
-                self.grid[self.cursor_y][self.cursor_x] = self.current_tool
-                
-            # File operations
-            elif key == ord('s'):
-                self.save_level()
-            elif key == ord('l'):
-                self.load_level()
-            elif key == ord('n'):
-                self.new_level()
-                
-            # Exit
-            elif key == ord('q'):
-                self.running = False
-                
-            # Help
-            elif key == ord('h'):
-                self.show_help()
+            elif key in self._key_tools:
+                self.current_tool, self.message = self._key_tools[key]
+            
+            # Placing, file operations, help and exit
+            elif key in self._key_actions:
+                self._key_actions[key]()
+            
+            else:
+                return False
                 
         except Exception as e:
             self.message = f"Error: {str(e)}"
+        return True
             
     def save_level(self):
         """Save the current level to a file"""
+        # The prompts below draw over the editor, so redraw everything afterwards
+        self.prev_grid = None
+        
         try:
             # Extract level data from grid
             platforms = []
             obstacles = []
             coins = []
-            player_pos = (0, 0)
+            player_pos = self.player_pos or (0, 0)
             
-            # Find platform segments
+            # Find platform segments, searching each row so runs do not wrap
+            grid, width = self.grid, self.level_width
             for y in range(self.level_height):
-                platform_start = None
-                for x in range(self.level_width):
-                    char = self.grid[y][x]
-                    
-                    if char == '=':
-                        if platform_start is None:
-                            platform_start = x
-                    elif platform_start is not None:
-                        # End of a platform segment
-                        platform_width = x - platform_start
-                        platforms.append((platform_start, y, platform_width))
-                        platform_start = None
-                        
-                    if char == 'o':
-                        coins.append((x, y))
-                    elif char == 'X':
-                        obstacles.append((x, y))
-                    elif char == 'P':
-                        player_pos = (x, y)
-                        
-                # Handle platform at the end of a line
-                if platform_start is not None:
-                    platform_width = self.level_width - platform_start
-                    platforms.append((platform_start, y, platform_width))
+                row_start = y * width
+                for run in PLATFORM_RUN.finditer(grid, row_start, row_start + width):
+                    platforms.append((run.start() - row_start, y, run.end() - run.start()))
+            
+            # Find obstacles and coins in a single pass over the whole grid
+            element_lists = {ord('X'): obstacles, ord('o'): coins}
+            for element in ELEMENT.finditer(grid):
+                y, x = divmod(element.start(), width)
+                element_lists[grid[element.start()]].append((x, y))
             
             # Prompt for filename
-            self.stdscr.addstr(self.level_height + 5, 1, "Enter filename (without .txt): ", curses.color_pair(5))
+            prompt = "Filename (.txt is added, end in .lvl for binary): "
+            self.stdscr.addstr(self.level_height + 5, 1, prompt, self._pairs[5])
             curses.echo()
-            filename = self.stdscr.getstr(self.level_height + 5, 35, 20).decode('utf-8')
+            filename = self.stdscr.getstr(self.level_height + 5, 1 + len(prompt), 20).decode('utf-8')
             curses.noecho()
             
             if not filename:
                 self.message = "Save cancelled"
                 return
                 
-            # Create full path
+            # Create full path, names ending in .lvl are saved in the packed binary format
             os.makedirs('levels', exist_ok=True)
-            path = os.path.join('levels', f"{filename}.txt")
+            if filename.endswith('.lvl'):
+                path = os.path.join('levels', filename)
+                create_level_file = self.loader.create_level_file_bin
+            else:
+                path = os.path.join('levels', f"{filename}.txt")
+                create_level_file = self.loader.create_level_file
             
             # Save the level
-            self.loader.create_level_file(
+            create_level_file(
                 path,
                 self.level_width,
                 self.level_height,
@@ -234,6 +293,9 @@ class LevelEditor:
             
     def load_level(self):
         """Load a level from file"""
+        # The prompts below draw over the editor, so redraw everything afterwards
+        self.prev_grid = None
+        
         try:
             level_files = self.loader.get_level_list()
             
@@ -243,15 +305,15 @@ class LevelEditor:
                 
             # Display available levels
             menu_y = self.level_height + 5
-            self.stdscr.addstr(menu_y, 1, "Select a level to load:", curses.color_pair(5))
+            self.stdscr.addstr(menu_y, 1, "Select a level to load:", self._pairs[5])
             
             for i, file in enumerate(level_files):
                 try:
-                    self.stdscr.addstr(menu_y + i + 1, 1, f"{i+1}. {os.path.basename(file)}", curses.color_pair(5))
+                    self.stdscr.addstr(menu_y + i + 1, 1, f"{i+1}. {os.path.basename(file)}", self._pairs[5])
                 except:
                     pass
             
-            self.stdscr.addstr(menu_y + len(level_files) + 1, 1, "Enter number: ", curses.color_pair(5))
+            self.stdscr.addstr(menu_y + len(level_files) + 1, 1, "Enter number: ", self._pairs[5])
             curses.echo()
             choice = self.stdscr.getstr(menu_y + len(level_files) + 1, 15, 2).decode('utf-8')
             curses.noecho()
@@ -264,38 +326,40 @@ class LevelEditor:
                     # Load the level data
                     platforms, obstacles, coins, player_pos, width, height = self.loader.load_level(selected_file)
                     
-                    # Update level dimensions if necessary
+                    # Update level dimensions if necessary, starting from a blank grid
                     if width != self.level_width or height != self.level_height:
                         self.level_width = min(width, self.width - 2)
                         self.level_height = min(height, self.height - 2)
-                        self.grid = [[' ' for _ in range(self.level_width)] for _ in range(self.level_height)]
-                    
-                    # Clear the grid
-                    for y in range(self.level_height):
-                        for x in range(self.level_width):
-                            self.grid[y][x] = ' '
+                        self.grid = bytearray(b' ' * (self.level_width * self.level_height))
+                        self._clamp_cursor()
+                    else:
+                        self.grid[:] = b' ' * len(self.grid)
+                    level_width = self.level_width
                     
-                    # Add platforms
+                    # Add platforms, clipped to the grid
                     for x, y, width in platforms:
-                        for i in range(width):
-                            if 0 <= x + i < self.level_width and 0 <= y < self.level_height:
-                                self.grid[y][x + i] = '='
+                        if 0 <= y < self.level_height:
+                            x0, x1 = max(0, x), min(level_width, x + width)
+                            if x1 > x0:
+                                self.grid[y * level_width + x0:y * level_width + x1] = b'=' * (x1 - x0)
                     
                     # Add obstacles
                     for x, y in obstacles:
-                        if 0 <= x < self.level_width and 0 <= y < self.level_height:
-                            self.grid[y][x] = 'X'
+                        if 0 <= x < level_width and 0 <= y < self.level_height:
+                            self.grid[y * level_width + x] = ord('X')
                     
                     # Add coins
                     for x, y in coins:
-                        if 0 <= x < self.level_width and 0 <= y < self.level_height:
-                            self.grid[y][x] = 'o'
+                        if 0 <= x < level_width and 0 <= y < self.level_height:
+                            self.grid[y * level_width + x] = ord('o')
                     
                     # Add player
+                    self.player_pos = None
                     if player_pos is not None:
                         px, py = player_pos
-                        if 0 <= px < self.level_width and 0 <= py < self.level_height:
-                            self.grid[py][px] = 'P'
+                        if 0 <= px < level_width and 0 <= py < self.level_height:
+                            self.grid[py * level_width + px] = ord('P')
+                            self.player_pos = (px, py)
                     
                     self.current_file = selected_file
                     self.message = f"Loaded level from {selected_file}"
@@ -310,12 +374,15 @@ class LevelEditor:
             
     def new_level(self):
         """Create a new blank level"""
+        # The prompts below draw over the editor, so redraw everything afterwards
+        self.prev_grid = None
+        
         try:
-            self.stdscr.addstr(self.level_height + 5, 1, "Enter level width (10-80): ", curses.color_pair(5))
+            self.stdscr.addstr(self.level_height + 5, 1, "Enter level width (10-80): ", self._pairs[5])
             curses.echo()
             width_str = self.stdscr.getstr(self.level_height + 5, 28, 3).decode('utf-8')
             
-            self.stdscr.addstr(self.level_height + 6, 1, "Enter level height (10-40): ", curses.color_pair(5))
+            self.stdscr.addstr(self.level_height + 6, 1, "Enter level height (10-40): ", self._pairs[5])
             height_str = self.stdscr.getstr(self.level_height + 6, 29, 3).decode('utf-8')
             curses.noecho()
             
@@ -330,14 +397,8 @@ class LevelEditor:
                 # Create a new level with those dimensions
                 self.level_width = min(width, self.width - 2)
                 self.level_height = min(height, self.height - 2)
-                self.grid = [[' ' for _ in range(self.level_width)] for _ in range(self.level_height)]
-                
-                # Add ground platform
-                for x in range(self.level_width):
-                    self.grid[self.level_height - 1][x] = '='
-                    
-                # Set player position
-                self.grid[self.level_height - 2][1] = 'P'
+                self._new_grid()
+                self._clamp_cursor()
                 
                 self.current_file = None
                 self.message = f"Created new level with size {self.level_width}x{self.level_height}"
@@ -371,23 +432,26 @@ class LevelEditor:
             "Press any key to continue..."
         ]
         
-        # Clear screen and show help
+        # Clear screen and show help, then redraw everything afterwards
+        self.prev_grid = None
         self.stdscr.clear()
-        for i, line in enumerate(help_text):
-            try:
-                self.stdscr.addstr(i + 1, 1, line, curses.color_pair(5))
-            except:
-                pass
+        try:
+            # Draw it in one call, the leading space after each newline keeps the left margin
+            self.stdscr.addstr(1, 1, "\n ".join(help_text), self._pairs[5])
+        except curses.error:
+            pass  # The screen is too small for all of it
                 
         self.stdscr.refresh()
         self.stdscr.getch()  # Wait for a key press
         
     def run(self):
         """Run the level editor main loop"""
+        # getch blocks until a key is pressed, so the loop sleeps while idle
+        # and only redraws after a key that changed something
+        self.render()
         while self.running:
-            self.render()
-            self.handle_input()
-            time.sleep(0.05)  # To reduce CPU usage
+            if self.handle_input() and self.running:
+                self.render()
             
 
 def main(stdscr):
@@ -397,13 +461,7 @@ def main(stdscr):
     Args:
         stdscr: Standard screen provided by curses
     """
-    # Initialize colors
-    curses.start_color()
-    curses.init_pair(1, curses.COLOR_GREEN, curses.COLOR_BLACK)
-    curses.init_pair(2, curses.COLOR_CYAN, curses.COLOR_BLACK)
-    curses.init_pair(3, curses.COLOR_RED, curses.COLOR_BLACK)
-    curses.init_pair(4, curses.COLOR_YELLOW, curses.COLOR_BLACK)
-    
+    # Colors are set up by LevelEditor
     editor = LevelEditor(stdscr)
     editor.run()
     
@@ -2,17 +2,50 @@
 Level Loader - Load level data from level files
 """
 import os
-import glob
+import re
+import sys
+import struct
+from array import array
+from typing import NamedTuple
+
+
+# Runs of platform cells and single-cell elements in a level row
+PLATFORM_RUN = re.compile(rb'=+')
+ELEMENT = re.compile(rb'[Xo@]')
+
+# Comment lines at the start of a text level file
+HEADER = re.compile(rb'(?:#[^\n]*(?:\n|\Z))*')
+
+# Level files are either text grids (.txt) or packed binary files (.lvl)
+LEVEL_EXTENSIONS = (".txt", ".lvl")
+
+# Packed level header: magic, width, height, platform/obstacle/coin counts and
+# player start (-1, -1 if none). It is followed by little-endian unsigned shorts:
+# x, y, width for each platform, then x, y for each obstacle and coin.
+LEVEL_MAGIC = b'LVL1'
+LEVEL_HEADER = struct.Struct('<4sHHHHHhh')
+
+
+class Platform(NamedTuple):
+    """
+    Horizontal platform segment with integer tile coordinates
+    """
+    x: int
+    y: int
+    width: int
+
 
 class LevelLoader:
     """
-    Load levels from text files
+    Load levels from text or packed binary files
     """
     def __init__(self):
         """
         Initialize the level loader
         """
         self.levels_dir = "levels"
+        self._level_list = None  # Cached result of get_level_list
+        self._level_list_mtime = None  # Modification time of levels_dir when it was cached
         # Ensure levels directory exists
         if not os.path.exists(self.levels_dir):
             os.makedirs(self.levels_dir)
@@ -21,18 +54,31 @@ class LevelLoader:
         """
         Get a list of available level files
         
+        The directory is only rescanned when its modification time changes
+        (a file was added, removed or renamed) or after a level file has been
+        written by this loader.
+        
         Returns:
             list: List of level file paths
         """
-        # Search for level files in the levels directory
-        level_files = glob.glob(os.path.join(self.levels_dir, "*.txt"))
-        # Sort them to ensure consistent order
-        level_files.sort()
-        return level_files
+        mtime = os.stat(self.levels_dir).st_mtime_ns
+        if self._level_list is None or mtime != self._level_list_mtime:
+            # Search for level files in the levels directory
+            with os.scandir(self.levels_dir) as entries:
+                level_files = [
+                    os.path.join(self.levels_dir, entry.name)
+                    for entry in entries
+                    if entry.name.endswith(LEVEL_EXTENSIONS) and not entry.name.startswith(".") and entry.is_file()
+                ]
+            # Sort them to ensure consistent order
+            level_files.sort()
+            self._level_list = level_files
+            self._level_list_mtime = mtime
+        return list(self._level_list)
     
     def load_level(self, level_path):
         """
-        Load a level from a text file
+        Load a level from a text or packed binary file
         
         Args:
             level_path: Path to the level file
@@ -40,64 +86,109 @@ class LevelLoader:
         Returns:
             tuple: (platforms, obstacles, coins, player_pos, level_width, level_height)
         """
-        with open(level_path, 'r') as file:
-            lines = file.readlines()
-        
-        # Parse level metadata from first lines
-        header_lines = []
-        level_data = []
-        header_section = True
-        
-        for line in lines:
-            line = line.rstrip()
-            if header_section:
-                if line.startswith('#'):
-                    header_lines.append(line)
-                else:
-                    header_section = False
-                    
-            if not header_section and line:
-                level_data.append(line)
-        
-        # Process header data to get dimensions
+        # Read the whole file in one go and parse it as bytes
+        with open(level_path, 'rb') as file:
+            data = file.read()
+        if data.startswith(LEVEL_MAGIC):
+            return self._parse_level_bin(data, level_path)
+        
+        # Skip the comment header, the level rows are the non-blank lines after it
+        rows_start = HEADER.match(data).end()
+        level_data = [line for line in map(bytes.rstrip, data[rows_start:].split(b'\n')) if line]
+        
+        # Get dimensions from the level rows
         level_width = max(len(line) for line in level_data) if level_data else 0
         level_height = len(level_data)
         
         # Parse level data and identify game elements
-        platforms = []  # List of (x, y, width) tuples
+        platforms = []  # List of Platform(x, y, width) tuples
         obstacles = []  # List of (x, y) tuples
         coins = []      # List of (x, y) tuples
         player_pos = None  # (x, y) tuple for player start position
         
         # Parse level layout
         for y, line in enumerate(level_data):
-            platform_start = None
-            for x, char in enumerate(line):
-                if char == '=':  # Platform
-                    if platform_start is None:
-                        platform_start = x
-                elif platform_start is not None:
-                    # End of current platform
-                    width = x - platform_start
-                    if width > 0:
-                        platforms.append((platform_start, y, width))
-                    platform_start = None
-                    
-                if char == 'X':  # Obstacle
-                    obstacles.append((x, y))
-                elif char == 'o':  # Coin
-                    coins.append((x, y))
-                elif char == '@':  # Player start position
-                    player_pos = (x, y)
+            for run in PLATFORM_RUN.finditer(line):
+                platforms.append(Platform(run.start(), y, run.end() - run.start()))
             
-            # Handle platform at the end of line
-            if platform_start is not None:
-                width = len(line) - platform_start
-                if width > 0:
-                    platforms.append((platform_start, y, width))
+            for element in ELEMENT.finditer(line):
+                char = element.group()
+                if char == b'X':  # Obstacle
+                    obstacles.append((element.start(), y))
+                elif char == b'o':  # Coin
+                    coins.append((element.start(), y))
+                else:  # Player start position
+                    player_pos = (element.start(), y)
         
         return platforms, obstacles, coins, player_pos, level_width, level_height
     
+    def _parse_level_bin(self, data, level_path):
+        """
+        Parse the contents of a packed binary level file
+        
+        Args:
+            data: File contents
+            level_path: Path of the file, for error messages
+            
+        Returns:
+            tuple: (platforms, obstacles, coins, player_pos, level_width, level_height)
+        """
+        magic, width, height, num_platforms, num_obstacles, num_coins, player_x, player_y = \
+            LEVEL_HEADER.unpack_from(data)
+        if magic != LEVEL_MAGIC:
+            raise ValueError(f"Not a packed level file: {level_path}")
+        
+        values = array('H')
+        values.frombytes(data[LEVEL_HEADER.size:])
+        if sys.byteorder == 'big':
+            values.byteswap()
+        
+        obstacles_start = 3 * num_platforms
+        coins_start = obstacles_start + 2 * num_obstacles
+        coins_end = coins_start + 2 * num_coins
+        if len(values) != coins_end:
+            raise ValueError(f"Corrupt level file: {level_path}")
+        
+        platforms = [Platform(*values[i:i + 3]) for i in range(0, obstacles_start, 3)]
+        obstacles = list(zip(values[obstacles_start:coins_start:2], values[obstacles_start + 1:coins_start:2]))
+        coins = list(zip(values[coins_start:coins_end:2], values[coins_start + 1:coins_end:2]))
+        player_pos = (player_x, player_y) if player_x >= 0 else None
+        
+        return platforms, obstacles, coins, player_pos, width, height
+    
+    def create_level_file_bin(self, path, width, height, platforms, obstacles, coins, player_pos):
+        """
+        Create a new packed binary level file
+        
+        Args:
+            path: Path to save the level file
+            width: Level width
+            height: Level height
+            platforms: List of (x, y, width) tuples
+            obstacles: List of (x, y) tuples
+            coins: List of (x, y) tuples
+            player_pos: (x, y) tuple for player starting position
+        """
+        values = array('H')
+        for platform in platforms:
+            values.extend(platform)
+        for point in obstacles:
+            values.extend(point)
+        for point in coins:
+            values.extend(point)
+        if sys.byteorder == 'big':
+            values.byteswap()
+        
+        player_x, player_y = player_pos if player_pos else (-1, -1)
+        header = LEVEL_HEADER.pack(LEVEL_MAGIC, width, height, len(platforms), len(obstacles), len(coins),
+                                   player_x, player_y)
+        
+        with open(path, 'wb') as file:
+            file.write(header + values.tobytes())
+        
+        # The new file may not be in the cached level list yet
+        self._level_list = None
+    
     def create_level_file(self, path, width, height, platforms, obstacles, coins, player_pos):
         """
         Create a new level file
@@ -111,40 +202,46 @@ class LevelLoader:
             coins: List of (x, y) tuples
             player_pos: (x, y) tuple for player starting position
         """
-        # Create a 2D grid of empty spaces
-        grid = [[' ' for _ in range(width)] for _ in range(height)]
+        # Create a flat row-major grid of empty spaces
+        grid = bytearray(b' ' * (width * height))
         
-        # Place platforms in the grid
+        # Place platforms in the grid, clipped to its width
         for x, y, w in platforms:
-            for i in range(w):
-                if 0 <= x + i < width and 0 <= y < height:
-                    grid[y][x + i] = '='
+            if 0 <= y < height:
+                x0, x1 = max(0, x), min(width, x + w)
+                if x1 > x0:
+                    grid[y * width + x0:y * width + x1] = b'=' * (x1 - x0)
         
         # Place obstacles
         for x, y in obstacles:
             if 0 <= x < width and 0 <= y < height:
-                grid[y][x] = 'X'
+                grid[y * width + x] = ord('X')
         
         # Place coins
         for x, y in coins:
             if 0 <= x < width and 0 <= y < height:
-                grid[y][x] = 'o'
+                grid[y * width + x] = ord('o')
         
         # Place player start position
         if player_pos:
             x, y = player_pos
             if 0 <= x < width and 0 <= y < height:
-                grid[y][x] = '@'
-        
-        # Write the grid to the file
-        with open(path, 'w') as file:
-            # Add header with metadata
-            file.write(f"# Level dimensions: {width}x{height}\n")
-            file.write(f"# Legend: '@'=Player start, '='=Platform, 'o'=Coin, 'X'=Obstacle\n")
-            file.write("\n")
-            
-            # Write the grid
-            for row in grid:
-                file.write(''.join(row) + '\n')
+                grid[y * width + x] = ord('@')
+        
+        # Build the whole file in memory: header with metadata, then one line per grid row
+        contents = bytearray()
+        contents += f"# Level dimensions: {width}x{height}\n".encode('ascii')
+        contents += b"# Legend: '@'=Player start, '='=Platform, 'o'=Coin, 'X'=Obstacle\n"
+        contents += b"\n"
+        for y in range(height):
+            contents += grid[y * width:(y + 1) * width]
+            contents += b"\n"
+        
+        # Write it with a single call
+        with open(path, 'wb') as file:
+            file.write(contents)
+        
+        # The new file may not be in the cached level list yet
+        self._level_list = None
         
         print(f"Level saved to {path}")
\ No newline at end of file
@@ -1,11 +1,19 @@
 """
 Player class - Handle player movement and physics
 """
+import math
 
 class Player:
     """
     Player class with movement and physics
     """
+    # Fixed attribute slots, so the per-frame physics reads and writes skip the instance dict
+    __slots__ = (
+        'x', 'y', 'velocity_x', 'velocity_y',
+        'gravity', 'jump_strength', 'move_speed', 'max_velocity_x', 'max_velocity_y',
+        'on_ground', 'jumping',
+    )
+
     def __init__(self, x, y):
         """
         Initialize player position and physics attributes
@@ -35,11 +43,13 @@ class Player:
 
     def move_left(self):
         """Move player left"""
-        self.velocity_x = max(self.velocity_x - self.move_speed, -self.max_velocity_x)
+        velocity_x = self.velocity_x - self.move_speed
+        self.velocity_x = velocity_x if velocity_x > -self.max_velocity_x else -self.max_velocity_x
 
     def move_right(self):
         """Move player right"""
-        self.velocity_x = min(self.velocity_x + self.move_speed, self.max_velocity_x)
+        velocity_x = self.velocity_x + self.move_speed
+        self.velocity_x = velocity_x if velocity_x < self.max_velocity_x else self.max_velocity_x
 
     def jump(self):
         """Make the player jump if on ground"""
@@ -50,43 +60,56 @@ class Player:
 
     def apply_gravity(self):
         """Apply gravity to player's vertical velocity"""
-        self.velocity_y += self.gravity
+        velocity_y = self.velocity_y + self.gravity
         # Limit max fall speed
-        if self.velocity_y > self.max_velocity_y:
-            self.velocity_y = self.max_velocity_y
+        self.velocity_y = velocity_y if velocity_y < self.max_velocity_y else self.max_velocity_y
 
-    def check_platform_collision(self, platforms):
+    def check_platform_collision(self, level):
         """
         Check and handle collision with platforms
         
         Args:
-            platforms: List of platform tuples (x, y, width)
+            level: Level object with platforms indexed by row
             
         Returns:
             bool: True if player is on a platform, False otherwise
         """
+        # The player stays in one column during the check, so look up each
+        # row's platform mask (Level.platform_columns) at that column
+        y = self.y
+        column = math.floor(self.x)
+        row_columns = level.platform_columns.get
+        
         # Previous y position (before applying gravity)
-        prev_y = self.y - self.velocity_y
+        prev_y = y - self.velocity_y
         
         # Reset on_ground status
         self.on_ground = False
         
-        for platform in platforms:
-            platform_x, platform_y, platform_width = platform
-            
-            # Check if player is within the x-range of the platform
-            if platform_x <= self.x < platform_x + platform_width:
-                # Check if player is landing on the platform (was above, now at or below)
-                if prev_y <= platform_y and self.y >= platform_y:
-                    self.y = platform_y  # Place player on top of platform
-                    self.velocity_y = 0  # Stop vertical movement
-                    self.on_ground = True
-                    return True
-                
-                # Check for hitting platform from below
-                elif prev_y >= platform_y + 1 and self.y <= platform_y + 1:
-                    self.y = platform_y + 1  # Push player down
-                    self.velocity_y = 0.5  # Bounce slightly
+        # There are no platforms left of column 0: platforms always start at
+        # x >= 0 (asserted in Level._build_platform_rows), so no platform span
+        # can cover a negative column
+        if column < 0:
+            return False
+        
+        # Check for hitting a platform from below, nearest one first
+        for platform_y in range(math.floor(prev_y - 1), math.ceil(y - 1) - 1, -1):
+            columns = row_columns(platform_y)
+            if columns and column < len(columns) and columns[column]:
+                y = self.y = platform_y + 1  # Push player down
+                self.velocity_y = 0.5  # Bounce slightly
+                break
+        
+        # Check if player is landing on a platform (was above, now at or below),
+        # trying the rows crossed this frame from the top down. Being pushed back
+        # down onto the row the player started from counts as landing.
+        for platform_y in range(math.ceil(prev_y), math.floor(y) + 1):
+            columns = row_columns(platform_y)
+            if columns and column < len(columns) and columns[column]:
+                self.y = platform_y  # Place player on top of platform
+                self.velocity_y = 0  # Stop vertical movement
+                self.on_ground = True
+                return True
         
         return False
 
@@ -104,20 +127,20 @@ class Player:
         self.x += self.velocity_x
         self.y += self.velocity_y
         
-        # Check collision with platforms
-        self.check_platform_collision(level.platforms)
-        
-        # Apply friction when on ground
-        if self.on_ground:
-            self.velocity_x *= 0.8  # Friction
-            if abs(self.velocity_x) < 0.1:
-                self.velocity_x = 0
+        # Check collision with platforms, applying friction when on ground
+        velocity_x = self.velocity_x
+        if self.check_platform_collision(level):
+            velocity_x *= 0.8  # Friction
+            if -0.1 < velocity_x < 0.1:
+                velocity_x = 0
             self.jumping = False
         
         # Implement screen boundaries
-        if self.x < 0:
+        x = self.x
+        if x < 0:
             self.x = 0
-            self.velocity_x = 0
-        elif self.x >= level.width:
+            velocity_x = 0
+        elif x >= level.width:
             self.x = level.width - 1
-            self.velocity_x = 0
+            velocity_x = 0
+        self.velocity_x = velocity_x
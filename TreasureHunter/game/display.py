@@ -6,6 +6,7 @@ Handles terminal output formatting and rendering.
 import os
 import sys
 import time
+from functools import lru_cache
 
 # ANSI color codes
 COLORS = {
@@ -29,69 +30,168 @@ COLORS = {
     'bg_white': '\033[47m',
 }
 
+# Clears the terminal and moves the cursor to the top left corner
+CLEAR_SCREEN = '\033[2J\033[H'
+
+# Seconds an event message stays on screen. Setting TH_EVENT_DELAY=0 skips all
+# pauses, for headless runs and benchmarks.
+try:
+    EVENT_DELAY = float(os.environ.get('TH_EVENT_DELAY', '1.5'))
+except ValueError:
+    EVENT_DELAY = 1.5  # Not a number, use the default
+
+if os.name == 'nt':
+    # Let the Windows console interpret the ANSI escape codes used here
+    import ctypes
+    _kernel32 = ctypes.windll.kernel32
+    _stdout_handle = _kernel32.GetStdHandle(-11)  # STD_OUTPUT_HANDLE
+    _console_mode = ctypes.c_ulong()
+    if _kernel32.GetConsoleMode(_stdout_handle, ctypes.byref(_console_mode)):
+        # ENABLE_VIRTUAL_TERMINAL_PROCESSING
+        _kernel32.SetConsoleMode(_stdout_handle, _console_mode.value | 0x0004)
+
 def clear_screen():
     """Clear the terminal screen."""
-    os.system('cls' if os.name == 'nt' else 'clear')
+    sys.stdout.write(CLEAR_SCREEN)
+    sys.stdout.flush()
 
 def print_colored(text, color='white'):
     """Print text with the specified color."""
     print(f"{COLORS.get(color, COLORS['white'])}{text}{COLORS['reset']}")
 
+@lru_cache(maxsize=256)
 def format_colored(text, color='white'):
-    """Format text with the specified color."""
+    """Format text with the specified color. Results are cached, the same few strings are formatted every frame."""
     return f"{COLORS.get(color, COLORS['white'])}{text}{COLORS['reset']}"
 
-def slow_print(text, delay=0.03):
-    """Print text character by character with a delay."""
-    for char in text:
-        print(char, end='', flush=True)
-        time.sleep(delay)
+# Colored glyph for each dungeon cell, the player and the frame decorations,
+# built once instead of on every render
+PLAYER_GLYPH = format_colored('@', 'white')
+# Glyph for every byte value, so a row of cells maps to text with one lookup
+# per cell. Unknown bytes and hidden cells (a space) are drawn blank.
+CELL_GLYPHS = [' '] * 256
+CELL_GLYPHS[ord('#')] = format_colored('#', 'gray')    # Wall
+CELL_GLYPHS[ord('.')] = format_colored('.', 'gray')    # Empty
+CELL_GLYPHS[ord('T')] = format_colored('T', 'red')     # Trap
+CELL_GLYPHS[ord('M')] = format_colored('M', 'red')     # Monster
+CELL_GLYPHS[ord('$')] = format_colored('$', 'green')   # Treasure
+CELL_GLYPHS[ord('E')] = format_colored('E', 'blue')    # Exit
+TITLE_BANNER = "\n".join([
+    format_colored("=" * 60, 'yellow'),
+    format_colored(" TREASURE HUNTER ", 'yellow'),
+    format_colored("=" * 60, 'yellow'),
+])
+DIVIDER = format_colored("-" * 60, 'yellow')
+HEALTH_BARS = [format_colored('♥' * health, 'red') for health in range(11)]
+# Rendered row text keyed by (row cells, revealed mask), for rows without the player
+ROW_CACHE_SIZE = 256
+_row_cache = {}
+
+CONTROLS_TEXT = "Controls: W/↑=Up, A/←=Left, S/↓=Down, D/→=Right, H=Help, Q=Quit"
+
+def slow_print(text, delay=0.03, chunk_size=8):
+    """
+    Print text a few characters at a time with a delay.
+    
+    Each chunk is written and flushed once, and the text is printed in one go
+    when stdout is not a terminal.
+    
+    Args:
+        text: Text to print
+        delay: Delay per character in seconds
+        chunk_size: Number of characters written at a time
+    """
+    if not sys.stdout.isatty():
+        print(text)
+        return
+    
+    for i in range(0, len(text), chunk_size):
+        chunk = text[i:i + chunk_size]
+        sys.stdout.write(chunk)
+        sys.stdout.flush()
+        time.sleep(delay * len(chunk))
     print()
 
-def render_dungeon(dungeon, player, revealed_cells, score, health, turns):
-    """Render the dungeon map with player, enemies, and items."""
-    clear_screen()
+def pause(seconds):
+    """
+    Wait so the player can read the screen.
+    
+    Nothing is waited for when pauses are disabled with TH_EVENT_DELAY=0 or
+    when stdout is not a terminal.
+    
+    Args:
+        seconds: Time to wait in seconds
+    """
+    if EVENT_DELAY > 0 and sys.stdout.isatty():
+        time.sleep(seconds)
+
+def _row_glyphs(row, revealed_mask):
+    """
+    Get the colored glyphs of one dungeon row.
+    
+    Args:
+        row: The row's cells, a bytearray
+        revealed_mask: Bit x is set if cell x has been revealed
+        
+    Returns:
+        list: One glyph string per cell
+    """
+    # Blank out the cells that have not been revealed yet (fog of war)
+    if revealed_mask != (1 << len(row)) - 1:
+        row = bytes(cell if revealed_mask >> x & 1 else 32 for x, cell in enumerate(row))
+    return list(map(CELL_GLYPHS.__getitem__, row))
+
+def render_dungeon(dungeon, player, revealed_rows, score, health, turns):
+    """
+    Render the dungeon map with player, enemies, and items.
+    
+    Args:
+        dungeon: The dungeon grid, a list of bytearray rows
+        player: The player, drawn at its position
+        revealed_rows: One bitmask per row, bit x is set if cell x has been revealed
+        score: Score shown in the header
+        health: Health shown in the header
+        turns: Turn count shown in the header
+    """
+    # Build the whole frame, starting with a screen clear, and write it at once
+    lines = [CLEAR_SCREEN]
     
     # Header
-    print_colored("=" * 60, 'yellow')
-    print_colored(" TREASURE HUNTER ", 'yellow')
-    print_colored("=" * 60, 'yellow')
-    print(f"Score: {format_colored(str(score), 'green')}  |  "
-          f"Health: {format_colored('♥' * health, 'red')}  |  "
-          f"Turns: {format_colored(str(turns), 'cyan')}")
-    print_colored("-" * 60, 'yellow')
-    
-    # Render the dungeon
-    for y in range(len(dungeon)):
-        line = ""
-        for x in range(len(dungeon[0])):
-            # Check if this is the player's position
-            if player.x == x and player.y == y:
-                line += format_colored('@', 'white')
-            # Check if the cell is revealed or within view distance
-            elif (x, y) in revealed_cells:
-                cell = dungeon[y][x]
-                if cell == '#':  # Wall
-                    line += format_colored('#', 'gray')
-                elif cell == '.':  # Empty
-                    line += format_colored('.', 'gray')
-                elif cell == 'T':  # Trap
-                    line += format_colored('T', 'red')
-                elif cell == 'M':  # Monster
-                    line += format_colored('M', 'red')
-                elif cell == '$':  # Treasure
-                    line += format_colored('$', 'green')
-                elif cell == 'E':  # Exit
-                    line += format_colored('E', 'blue')
-                else:
-                    line += ' '
-            else:
-                # Fog of war - unexplored area
-                line += ' '
-        print(line)
-    
-    print_colored("-" * 60, 'yellow')
-    print("Controls: W/↑=Up, A/←=Left, S/↓=Down, D/→=Right, H=Help, Q=Quit")
+    health_bar = HEALTH_BARS[health] if 0 <= health < len(HEALTH_BARS) else format_colored('♥' * health, 'red')
+    lines.append(TITLE_BANNER)
+    lines.append(f"Score: {format_colored(str(score), 'green')}  |  "
+                 f"Health: {health_bar}  |  "
+                 f"Turns: {format_colored(str(turns), 'cyan')}")
+    lines.append(DIVIDER)
+    
+    # Render the dungeon, reusing the text of rows that look the same as before.
+    # The player's row is built separately, with the player drawn over its cell.
+    # Everything the loop touches is bound to a local first.
+    player_x, player_y = player.x, player.y
+    append = lines.append
+    row_cache = _row_cache
+    cache_get = row_cache.get
+    row_glyphs = _row_glyphs
+    for y, (row, revealed_mask) in enumerate(zip(dungeon, revealed_rows)):
+        if y == player_y:
+            line_parts = row_glyphs(row, revealed_mask)
+            line_parts[player_x] = PLAYER_GLYPH
+            append(''.join(line_parts))
+            continue
+        key = (bytes(row), revealed_mask)
+        line = cache_get(key)
+        if line is None:
+            line = ''.join(row_glyphs(row, revealed_mask))
+            if len(row_cache) >= ROW_CACHE_SIZE:
+                del row_cache[next(iter(row_cache))]  # Evict the oldest entry
+            row_cache[key] = line
+        append(line)
+    
+    lines.append(DIVIDER)
+    lines.append(CONTROLS_TEXT)
+    
+    sys.stdout.write(lines[0] + "\n".join(lines[1:]) + "\n")
+    sys.stdout.flush()
 
 def show_help():
     """Display the help screen."""
@@ -123,7 +223,7 @@ def show_help():
     
     print_colored("\nReturning to game in 3 seconds...", 'yellow')
     # Replace input with a timed delay
-    time.sleep(3)
+    pause(3)
 
 def game_over(win, score, turns):
     """Display the game over screen."""
@@ -160,14 +260,9 @@ def game_over(win, score, turns):
     print_colored(f"Turns Taken: {turns}", 'yellow')
     
     print_colored("\nGame will restart in 5 seconds...", 'cyan')
-    time.sleep(5)  # Give time to read the game over screen
-    
-    # Automatically restart the game
-    from game.game_engine import GameEngine
-    game = GameEngine()
-    game.start_game()
+    pause(5)  # Give time to read the game over screen, GameEngine.start_game then restarts
 
 def display_event_message(message, color='white'):
     """Display an event message at the bottom of the screen."""
     print_colored(message, color)
-    time.sleep(1.5)  # Show the message for a short time
+    pause(EVENT_DELAY)  # Show the message for a short time
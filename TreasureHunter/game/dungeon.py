@@ -6,6 +6,14 @@ Creates random dungeon layouts with rooms, corridors, and entities.
 import random
 import time
 
+# Dungeon cell values. Each dungeon row is a bytearray holding these ASCII codes.
+WALL = ord('#')
+FLOOR = ord('.')
+TRAP = ord('T')
+MONSTER = ord('M')
+TREASURE = ord('$')
+EXIT = ord('E')
+
 class DungeonGenerator:
     """
     Generates a random dungeon layout for the Treasure Hunter game.
@@ -28,8 +36,8 @@ class DungeonGenerator:
         self.complexity = complexity
         self.density = density
         
-        # Create a dungeon filled with walls initially
-        self.dungeon = [['#' for _ in range(width)] for _ in range(height)]
+        # Create a dungeon filled with walls initially, one bytearray per row
+        self.dungeon = [bytearray(b'#' * width) for _ in range(height)]
         
         # Track positions of key elements
         self.player_start = None
@@ -78,10 +86,11 @@ class DungeonGenerator:
             room_y = random.randint(2, self.height - 3)
             room_size = random.randint(3, 5)
             
-            # Carve out the room
+            # Carve out the room, one slice per row
+            x0 = max(1, room_x - room_size // 2)
+            x1 = min(self.width - 1, room_x + room_size // 2)
             for y in range(max(1, room_y - room_size // 2), min(self.height - 1, room_y + room_size // 2)):
-                for x in range(max(1, room_x - room_size // 2), min(self.width - 1, room_x + room_size // 2)):
-                    self.dungeon[y][x] = '.'
+                self.dungeon[y][x0:x1] = b'.' * max(0, x1 - x0)
         
         # Add some random corridors to connect rooms
         for _ in range(self.width + self.height):
@@ -92,30 +101,36 @@ class DungeonGenerator:
             direction = random.choice([(0, 1), (1, 0), (0, -1), (-1, 0)])
             length = random.randint(3, 8)
             
-            # Create the corridor
-            for i in range(length):
-                x = x1 + direction[0] * i
-                y = y1 + direction[1] * i
-                
-                if 1 <= x < self.width - 1 and 1 <= y < self.height - 1:
-                    self.dungeon[y][x] = '.'
+            # Create the corridor, clipped to the interior
+            dx, dy = direction
+            if dx:
+                # Horizontal: one slice of the start row
+                start, end = (x1, x1 + length) if dx > 0 else (x1 - length + 1, x1 + 1)
+                start, end = max(1, start), min(self.width - 1, end)
+                self.dungeon[y1][start:end] = b'.' * max(0, end - start)
+            else:
+                # Vertical: one cell in each row it crosses
+                start, end = (y1, y1 + length) if dy > 0 else (y1 - length + 1, y1 + 1)
+                for y in range(max(1, start), min(self.height - 1, end)):
+                    self.dungeon[y][x1] = FLOOR
         
         # Ensure the dungeon is surrounded by walls
-        for x in range(self.width):
-            self.dungeon[0][x] = '#'
-            self.dungeon[self.height - 1][x] = '#'
+        self.dungeon[0][:] = b'#' * self.width
+        self.dungeon[self.height - 1][:] = b'#' * self.width
         
-        for y in range(self.height):
-            self.dungeon[y][0] = '#'
-            self.dungeon[y][self.width - 1] = '#'
+        for row in self.dungeon:
+            row[0] = row[self.width - 1] = WALL
     
     def _collect_empty_spaces(self):
         """Collect all empty spaces for faster entity placement."""
         self.empty_spaces = []
         for y in range(1, self.height - 1):
-            for x in range(1, self.width - 1):
-                if self.dungeon[y][x] == '.':
-                    self.empty_spaces.append((x, y))
+            # Jump between floor cells with find rather than testing every cell
+            row = self.dungeon[y]
+            x = row.find(FLOOR, 1, self.width - 1)
+            while x >= 0:
+                self.empty_spaces.append((x, y))
+                x = row.find(FLOOR, x + 1, self.width - 1)
         
         # Shuffle the list for random access
         random.shuffle(self.empty_spaces)
@@ -126,7 +141,7 @@ class DungeonGenerator:
             # Fallback - find any open space
             for y in range(1, self.height - 1):
                 for x in range(1, self.width - 1):
-                    if self.dungeon[y][x] == '.':
+                    if self.dungeon[y][x] == FLOOR:
                         self.player_start = (x, y)
                         # Clear area around player start
                         self._clear_area_around(x, y, 1)
@@ -134,50 +149,55 @@ class DungeonGenerator:
             
             # If still no open space, force create one
             x, y = self.width // 4, self.height // 2
-            self.dungeon[y][x] = '.'
+            self.dungeon[y][x] = FLOOR
             self.player_start = (x, y)
             self._clear_area_around(x, y, 1)
             return
             
-        # Use first space from the shuffled list
-        x, y = self.empty_spaces.pop(0)
+        # Use the last space from the shuffled list, popping the end is O(1)
+        x, y = self.empty_spaces.pop()
         self.player_start = (x, y)
         
         # Ensure there's some open space around the player
         self._clear_area_around(x, y, 1)
     
+    def _remove_empty_space(self, index):
+        """Remove an entry from empty_spaces in O(1) by moving the last entry into its place."""
+        last = self.empty_spaces.pop()
+        if index < len(self.empty_spaces):
+            self.empty_spaces[index] = last
+    
     def _clear_area_around(self, x, y, radius):
         """Clear walls around a point to create open space."""
-        for dy in range(-radius, radius + 1):
-            for dx in range(-radius, radius + 1):
-                ny, nx = y + dy, x + dx
-                if (0 < ny < self.height - 1 and 0 < nx < self.width - 1):
-                    if self.dungeon[ny][nx] == '#':
-                        self.dungeon[ny][nx] = '.'
-                        # Add to empty spaces if not already used
-                        if (nx, ny) not in self.empty_spaces and (nx, ny) != self.player_start:
-                            self.empty_spaces.append((nx, ny))
+        # The square around the point, clipped to the interior
+        x0, x1 = max(1, x - radius), min(self.width - 2, x + radius)
+        for ny in range(max(1, y - radius), min(self.height - 2, y + radius) + 1):
+            row = self.dungeon[ny]
+            for nx in range(x0, x1 + 1):
+                if row[nx] == WALL:
+                    row[nx] = FLOOR
+                    # A cell that was a wall is neither an empty space yet nor the
+                    # player start, so it can be added without searching the list
+                    self.empty_spaces.append((nx, ny))
     
     def _place_exit(self):
         """Place the exit in the dungeon, far from the entrance."""
         # The exit should be some distance from the start
         min_distance = max(5, (self.width + self.height) // 5)
         
-        # Try from existing empty spaces
+        # Try from existing empty spaces, taking the first far enough from the start
+        start_x, start_y = self.player_start
         for i, (x, y) in enumerate(self.empty_spaces):
-            # Calculate Manhattan distance from start
-            distance = abs(x - self.player_start[0]) + abs(y - self.player_start[1])
-            
-            if distance >= min_distance:
-                self.dungeon[y][x] = 'E'
+            if abs(x - start_x) + abs(y - start_y) >= min_distance:
+                self.dungeon[y][x] = EXIT
                 self.exit_pos = (x, y)
                 # Remove from empty spaces
-                self.empty_spaces.pop(i)
+                self._remove_empty_space(i)
                 return
         
         # If no suitable position found, force placement
         farthest_x, farthest_y = self.width - self.player_start[0] - 2, self.height - self.player_start[1] - 2
-        self.dungeon[farthest_y][farthest_x] = 'E'
+        self.dungeon[farthest_y][farthest_x] = EXIT
         self.exit_pos = (farthest_x, farthest_y)
         
         # Clear area around exit to ensure it's accessible
@@ -191,82 +211,75 @@ class DungeonGenerator:
             
         # Try to place between start and exit
         if self.empty_spaces:
-            best_pos = None
-            best_score = float('inf')
+            start_x, start_y = self.player_start
+            exit_x, exit_y = self.exit_pos
             
-            # Check up to 10 random positions to find a good spot
-            for _ in range(min(10, len(self.empty_spaces))):
-                pos_index = random.randint(0, len(self.empty_spaces) - 1)
-                x, y = self.empty_spaces[pos_index]
-                
-                # Calculate distances
-                distance_to_start = abs(x - self.player_start[0]) + abs(y - self.player_start[1])
-                distance_to_exit = abs(x - self.exit_pos[0]) + abs(y - self.exit_pos[1])
-                
-                # Lower score means better positioned (not too close to start, but on path to exit)
-                score = abs(distance_to_start - 3) + abs(distance_to_exit - distance_to_start)
-                
-                if score < best_score:
-                    best_score = score
-                    best_pos = (pos_index, x, y)
+            # Score every empty space in one pass. Lower score means better positioned
+            # (not too close to start, but on path to exit). Ties go to the earlier
+            # entry, which is random since the list is shuffled.
+            scores = []
+            for x, y in self.empty_spaces:
+                distance_to_start = abs(x - start_x) + abs(y - start_y)
+                distance_to_exit = abs(x - exit_x) + abs(y - exit_y)
+                scores.append(abs(distance_to_start - 3) + abs(distance_to_exit - distance_to_start))
             
-            if best_pos:
-                pos_index, x, y = best_pos
-                self.dungeon[y][x] = '$'
-                self.treasure_pos = (x, y)
-                self.empty_spaces.pop(pos_index)
-                return
+            pos_index = scores.index(min(scores))
+            x, y = self.empty_spaces[pos_index]
+            self.dungeon[y][x] = TREASURE
+            self.treasure_pos = (x, y)
+            self._remove_empty_space(pos_index)
+            return
         
         # Fallback - place somewhere between start and exit
         mid_x = (self.player_start[0] + self.exit_pos[0]) // 2
         mid_y = (self.player_start[1] + self.exit_pos[1]) // 2
         
-        if self.dungeon[mid_y][mid_x] == '.':
-            self.dungeon[mid_y][mid_x] = '$'
+        if self.dungeon[mid_y][mid_x] == FLOOR:
+            self.dungeon[mid_y][mid_x] = TREASURE
             self.treasure_pos = (mid_x, mid_y)
         else:
-            # Find nearest empty space
+            # Find nearest empty space, walking the cells at distance d directly:
+            # each row of the diamond has one cell on either side
             for d in range(1, max(self.width, self.height)):
                 for dy in range(-d, d+1):
-                    for dx in range(-d, d+1):
-                        if abs(dx) + abs(dy) == d:  # Check only perimeter at distance d
-                            nx, ny = mid_x + dx, mid_y + dy
-                            if (0 < nx < self.width - 1 and 0 < ny < self.height - 1 and 
-                                self.dungeon[ny][nx] == '.'):
-                                self.dungeon[ny][nx] = '$'
-                                self.treasure_pos = (nx, ny)
-                                return
+                    reach = d - abs(dy)
+                    for dx in ((-reach, reach) if reach else (0,)):
+                        nx, ny = mid_x + dx, mid_y + dy
+                        if (0 < nx < self.width - 1 and 0 < ny < self.height - 1 and 
+                            self.dungeon[ny][nx] == FLOOR):
+                            self.dungeon[ny][nx] = TREASURE
+                            self.treasure_pos = (nx, ny)
+                            return
     
     def _place_traps(self, count):
         """Place traps randomly in the dungeon with improved reliability."""
-        count = min(count, len(self.empty_spaces))
-        
-        for _ in range(count):
-            if not self.empty_spaces:
-                break
-                
-            # Get a random empty position
-            pos_index = random.randint(0, len(self.empty_spaces) - 1)
-            x, y = self.empty_spaces[pos_index]
-            
-            # Don't place traps too close to the start point
-            if abs(x - self.player_start[0]) + abs(y - self.player_start[1]) > 3:
-                self.dungeon[y][x] = 'T'
-                self.empty_spaces.pop(pos_index)
+        # Don't place traps too close to the start point
+        self._place_at_random(TRAP, count, 3)
     
     def _place_monsters(self, count):
         """Place monsters randomly in the dungeon with improved reliability."""
-        count = min(count, len(self.empty_spaces))
+        # Don't place monsters too close to the start point
+        self._place_at_random(MONSTER, count, 4)
+    
+    def _place_at_random(self, cell, count, min_distance):
+        """
+        Place a cell type at up to count random empty spaces.
         
-        for _ in range(count):
-            if not self.empty_spaces:
-                break
-                
-            # Get a random empty position
-            pos_index = random.randint(0, len(self.empty_spaces) - 1)
-            x, y = self.empty_spaces[pos_index]
-            
-            # Don't place monsters too close to the start point
-            if abs(x - self.player_start[0]) + abs(y - self.player_start[1]) > 4:
-                self.dungeon[y][x] = 'M'
-                self.empty_spaces.pop(pos_index)
+        Args:
+            cell: Cell value to place
+            count: Number of empty spaces to draw
+            min_distance: Spaces within this Manhattan distance of the start are skipped
+        """
+        start_x, start_y = self.player_start
+        placed = []
+        
+        # Draw all the positions at once, without repeats
+        for i in random.sample(range(len(self.empty_spaces)), min(count, len(self.empty_spaces))):
+            x, y = self.empty_spaces[i]
+            if abs(x - start_x) + abs(y - start_y) > min_distance:
+                self.dungeon[y][x] = cell
+                placed.append(i)
+        
+        # Remove the highest indices first, so no entry still to be removed is swapped into another slot
+        for i in sorted(placed, reverse=True):
+            self._remove_empty_space(i)
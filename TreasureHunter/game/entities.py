@@ -6,6 +6,9 @@ Handles game entities like monsters, traps, and items.
 class Entity:
     """Base class for all entities in the game."""
     
+    # Fixed attribute slots, entities carry no per-instance dict
+    __slots__ = ('x', 'y', 'symbol', 'name', 'description')
+    
     def __init__(self, x, y, symbol, name, description):
         """Initialize an entity with position and basic information."""
         self.x = x
@@ -21,6 +24,8 @@ class Entity:
 class Trap(Entity):
     """A trap that damages the player when stepped on."""
     
+    __slots__ = ('damage', 'triggered')
+    
     def __init__(self, x, y, damage=1):
         """Initialize a trap with a position and damage amount."""
         super().__init__(x, y, 'T', 'Trap', 'A dangerous trap')
@@ -41,6 +46,8 @@ class Trap(Entity):
 class Monster(Entity):
     """A monster that attacks the player when encountered."""
     
+    __slots__ = ('damage',)
+    
     def __init__(self, x, y, damage=1):
         """Initialize a monster with a position and damage amount."""
         super().__init__(x, y, 'M', 'Monster', 'A dangerous monster')
@@ -54,6 +61,8 @@ class Monster(Entity):
 class Treasure(Entity):
     """The main treasure that the player needs to find to win."""
     
+    __slots__ = ()
+    
     def __init__(self, x, y):
         """Initialize the treasure with a position."""
         super().__init__(x, y, '$', 'Treasure', 'The legendary treasure')
@@ -66,6 +75,8 @@ class Treasure(Entity):
 class Exit(Entity):
     """The exit that the player needs to reach with the treasure to win."""
     
+    __slots__ = ()
+    
     def __init__(self, x, y):
         """Initialize the exit with a position."""
         super().__init__(x, y, 'E', 'Exit', 'The exit from the dungeon')
@@ -3,8 +3,10 @@ Game engine module for the Treasure Hunter game.
 Coordinates game mechanics, input handling, and game state.
 """
 
+import os
 import sys
 import time
+import atexit
 import random
 import select
 
@@ -15,11 +17,19 @@ else:
     import tty
     import termios
 
-from game.dungeon import DungeonGenerator
+from game.dungeon import DungeonGenerator, WALL, FLOOR, TRAP, MONSTER, TREASURE, EXIT
 from game.player import Player
 from game.display import (render_dungeon, show_help, game_over, 
                           clear_screen, display_event_message)
 
+# Arrow keys, read as escape sequences on POSIX terminals and as a prefix
+# character followed by a scan code on Windows, mapped to the movement keys
+ARROW_KEYS = {
+    b'\x1b[A': 'w', b'\x1b[B': 's', b'\x1b[C': 'd', b'\x1b[D': 'a',
+    b'\x1bOA': 'w', b'\x1bOB': 's', b'\x1bOC': 'd', b'\x1bOD': 'a',
+}
+WINDOWS_ARROW_KEYS = {'H': 'w', 'P': 's', 'M': 'd', 'K': 'a'}
+
 class GameEngine:
     """
     Main game engine for Treasure Hunter.
@@ -39,13 +49,28 @@ class GameEngine:
         # Game elements
         self.dungeon = None
         self.player = None
-        self.revealed_cells = set()  # Cells that have been seen by the player
+        self.revealed_rows = []  # Cells seen by the player, one bitmask per row with bit x for column x
+        self._dirty = True  # Set when the game state shown on screen has changed
+        self._revealed_from = None  # Player position the revealed cells were last updated from
         
         # Pre-load some game elements
         self.dungeon_ready = False
+        
+        # Read single key presses without waiting for Enter, restoring the
+        # terminal settings on exit
+        if sys.platform != 'win32' and sys.stdin.isatty():
+            fd = sys.stdin.fileno()
+            atexit.register(termios.tcsetattr, fd, termios.TCSADRAIN, termios.tcgetattr(fd))
+            tty.setcbreak(fd)
     
     def start_game(self):
-        """Start a new game with optimized dungeon generation."""
+        """Start a new game, and another one after each game over, until the player quits."""
+        while True:
+            self._new_game()
+            self.game_loop()
+    
+    def _new_game(self):
+        """Set up a new game with optimized dungeon generation."""
         # Generate a new dungeon with maximum retry attempts
         max_attempts = 3
         player_start = None
@@ -62,54 +87,59 @@ class GameEngine:
                     # If all attempts failed, create a simple fallback dungeon
                     self.dungeon, player_start = self._create_fallback_dungeon()
         
+        # Player.move and the renderer index the grid without checking it,
+        # so make sure it is a non-empty list of equally wide rows
+        if (not isinstance(self.dungeon, list) or not self.dungeon
+                or any(len(row) != len(self.dungeon[0]) for row in self.dungeon)):
+            self.dungeon, player_start = self._create_fallback_dungeon()
+        
         # Make sure we have a valid player start position
         if not player_start:
             player_start = (2, 2)  # Default position as last resort
             
         # Create the player at the starting position
         self.player = Player(player_start[0], player_start[1])
+        self.player.bind_dungeon(self.dungeon)
         
         # Reset game state
         self.score = 100
         self.turns = 0
         self.running = True
         self.won = False
-        self.revealed_cells = set()
-        
-        # Run the game loop
-        self.game_loop()
+        self.revealed_rows = [0] * len(self.dungeon)
+        self._dirty = True  # The screen needs to be redrawn
+        self._revealed_from = None  # Player position the revealed cells were last updated from
         
     def _create_fallback_dungeon(self):
         """Create a simple fallback dungeon if generation fails."""
         width, height = self.dungeon_width, self.dungeon_height
         # Create a simple dungeon with walls around the edges
-        self.dungeon = [['#' for _ in range(width)] for _ in range(height)]
+        self.dungeon = [bytearray(b'#' * width) for _ in range(height)]
         
         # Fill interior with empty space
         for y in range(1, height - 1):
-            for x in range(1, width - 1):
-                self.dungeon[y][x] = '.'
+            self.dungeon[y][1:width - 1] = b'.' * (width - 2)
         
         # Add some random walls
         for _ in range(width * height // 10):
             x, y = random.randint(1, width - 2), random.randint(1, height - 2)
-            self.dungeon[y][x] = '#'
+            self.dungeon[y][x] = WALL
         
         # Place player start, exit, and treasure
         player_start = (2, 2)
-        self.dungeon[height-2][width-2] = 'E'  # Exit in bottom-right
-        self.dungeon[height//2][width//2] = '$'  # Treasure in middle
+        self.dungeon[height-2][width-2] = EXIT  # Exit in bottom-right
+        self.dungeon[height//2][width//2] = TREASURE  # Treasure in middle
         
         # Add a few traps and monsters
         for _ in range(3):
             x, y = random.randint(3, width - 3), random.randint(3, height - 3)
-            if self.dungeon[y][x] == '.':
-                self.dungeon[y][x] = 'T'
+            if self.dungeon[y][x] == FLOOR:
+                self.dungeon[y][x] = TRAP
                 
         for _ in range(2):
             x, y = random.randint(3, width - 3), random.randint(3, height - 3)
-            if self.dungeon[y][x] == '.':
-                self.dungeon[y][x] = 'M'
+            if self.dungeon[y][x] == FLOOR:
+                self.dungeon[y][x] = MONSTER
                 
         self.dungeon_ready = True
         
@@ -118,24 +148,21 @@ class GameEngine:
     
     def game_loop(self):
         """Main game loop with improved performance."""
-        last_render_time = 0
-        
         # Give the player an initial score if they don't have one
         if not hasattr(self.player, 'score') or self.player.score == 0:
             self.player.score = 100
             
         while self.running:
             # Update revealed cells based on player's vision
-            self._update_revealed_cells()
-            
-            # Get current time to throttle rendering if needed
-            current_time = time.time()
+            if self._update_revealed_cells():
+                self._dirty = True
             
-            # Render the current game state 
+            # Render the current game state, only when something has changed
             # Using player's score directly
-            render_dungeon(self.dungeon, self.player, self.revealed_cells, 
-                          self.player.score, self.player.health, self.turns)
-            last_render_time = current_time
+            if self._dirty:
+                render_dungeon(self.dungeon, self.player, self.revealed_rows, 
+                              self.player.score, self.player.health, self.turns)
+                self._dirty = False
             
             # Get player input
             action = self._get_input()
@@ -143,9 +170,10 @@ class GameEngine:
             # Only process action if it's not None
             if action:
                 self._process_action(action)
+                self._dirty = True
                 
                 # Check game conditions
-                if not self.player.is_alive():
+                if self.player.health <= 0:  # Player.is_alive, inlined
                     self.running = False
                     game_over(False, self.player.score, self.turns)
                     break
@@ -158,25 +186,43 @@ class GameEngine:
     
     def _get_input(self):
         """
-        Get keyboard input from the player in a Replit-compatible way.
+        Get a key press from the player, waiting at most half a second.
         
         Returns:
-            str: The key pressed by the player
+            str: The key pressed by the player, or None if no key was pressed
         """
-        # For Replit environment, use a simple input with a prompt
-        # This approach works in web-based terminals
-        print("\033[1mEnter move (w/a/s/d/h/q): \033[0m", end='', flush=True)
         try:
-            # Set a shorter timeout for input to keep the game responsive
-            import sys
-            if select.select([sys.stdin], [], [], 0.5)[0]:
-                key = input().lower()
-                if key:  # Only process if something was entered
-                    return key[0]  # Return just the first character
+            if sys.platform == 'win32':
+                deadline = time.monotonic() + 0.5
+                while not msvcrt.kbhit():
+                    if time.monotonic() >= deadline:
+                        return None
+                    time.sleep(0.02)
+                key = msvcrt.getwch()
+                if key in ('\x00', '\xe0'):
+                    return WINDOWS_ARROW_KEYS.get(msvcrt.getwch())
+                return key.lower()
             
-            # If no input was received, return None
-            return None
-        except Exception as e:
+            if not select.select([sys.stdin], [], [], 0.5)[0]:
+                return None
+            # Read a single key, so keys typed ahead stay queued for later turns
+            fd = sys.stdin.fileno()
+            data = os.read(fd, 1)
+            if not data:
+                raise EOFError("end of input")
+            if data == b'\x1b':
+                # An arrow key sends the rest of its escape sequence right away
+                while len(data) < 3 and select.select([sys.stdin], [], [], 0)[0]:
+                    byte = os.read(fd, 1)
+                    if not byte:
+                        break
+                    data += byte
+                return ARROW_KEYS.get(data)
+            key = data.decode('ascii', 'ignore').lower()
+            return key if key.strip() else None
+        except (OSError, EOFError, ValueError) as e:
+            # Only terminal read errors are handled here, anything else is a bug
+            # and goes to the handler in treasure_hunter.main
             print(f"Input error: {e}")
             # Give a small delay to prevent CPU spikes
             time.sleep(0.1)
@@ -221,7 +267,7 @@ class GameEngine:
                 display_event_message(message, 'cyan')
                 
                 # Check for win condition
-                if cell_content == 'E' and self.player.has_treasure:
+                if cell_content == EXIT and self.player.has_treasure:
                     self.won = True
                     self.running = False
                     # Bonus points for finishing with more health and fewer turns
@@ -231,7 +277,23 @@ class GameEngine:
                     game_over(True, self.player.score, self.turns)
     
     def _update_revealed_cells(self):
-        """Update the set of cells that have been revealed to the player."""
-        # Add currently visible cells to the set of revealed cells
-        visible = self.player.get_visible_cells(self.dungeon)
-        self.revealed_cells.update(visible)
+        """
+        Update the cells that have been revealed to the player.
+        
+        Returns:
+            bool: True if any cell was revealed for the first time
+        """
+        player = self.player
+        position = (player.x, player.y)
+        if position == self._revealed_from:
+            return False  # Nothing new can be seen from the same spot
+        self._revealed_from = position
+        
+        # Add currently visible cells to the revealed row masks
+        revealed_rows = self.revealed_rows
+        changed = False
+        for y, mask in player.get_visible_row_masks(self.dungeon):
+            if mask & ~revealed_rows[y]:
+                revealed_rows[y] |= mask
+                changed = True
+        return changed
@@ -4,6 +4,9 @@ Handles player state, movement, and actions.
 """
 
 import random
+from itertools import repeat
+
+from game.dungeon import WALL, FLOOR, TRAP, MONSTER, TREASURE, EXIT
 
 class Player:
     """
@@ -11,6 +14,20 @@ class Player:
     Tracks position, health, inventory, and handles movement.
     """
     
+    # Event messages, one is picked at random for variety
+    TRAP_MESSAGES = (
+        "Ouch! You stepped on a trap and lost 1 health!",
+        "A spike trap activates beneath you! You lose 1 health!",
+        "You triggered a hidden trap! -1 health!",
+        "The floor gives way slightly as you step on a pressure plate. A dart hits you! -1 health!",
+    )
+    MONSTER_MESSAGES = (
+        "A monster attacks you! You lost 1 health!",
+        "A dungeon creature lunges at you! -1 health!",
+        "A shadowy figure strikes from the darkness! You lose 1 health!",
+        "A guardian of the dungeon blocks your path and attacks! -1 health!",
+    )
+    
     def __init__(self, x, y, max_health=3):
         """Initialize the player with starting position and health."""
         self.x = x
@@ -19,26 +36,41 @@ class Player:
         self.health = max_health
         self.has_treasure = False
         self.view_distance = 3  # Increased view distance for better gameplay
+        self._view_rows = None  # (dy, reach) pairs describing the view shape, see _view_shape
+        self._view_rows_distance = None  # View distance _view_rows was built for
+        self._visible_key = None  # (x, y, view distance, width, height) the cached visible cells are for
+        self._visible_cells = None
         self.score = 0  # Track score directly on player
+        self._rng = random.Random()  # Own generator for move events, seeded from OS entropy
+        self._dungeon_width = 0  # Size of the dungeon set by bind_dungeon
+        self._dungeon_height = 0
         
-        # For gameplay variety
-        self.trap_messages = [
-            "Ouch! You stepped on a trap and lost 1 health!",
-            "A spike trap activates beneath you! You lose 1 health!",
-            "You triggered a hidden trap! -1 health!",
-            "The floor gives way slightly as you step on a pressure plate. A dart hits you! -1 health!"
-        ]
-        
-        self.monster_messages = [
-            "A monster attacks you! You lost 1 health!",
-            "A dungeon creature lunges at you! -1 health!",
-            "A shadowy figure strikes from the darkness! You lose 1 health!",
-            "A guardian of the dungeon blocks your path and attacks! -1 health!"
-        ]
+        # What happens when stepping onto each kind of cell
+        self._cell_handlers = {
+            FLOOR: self._enter_floor,
+            TRAP: self._enter_trap,
+            MONSTER: self._enter_monster,
+            TREASURE: self._enter_treasure,
+            EXIT: self._enter_exit,
+        }
+    
+    def bind_dungeon(self, dungeon):
+        """
+        Record the size of the dungeon the player moves in.
+        
+        The dungeon keeps its size for the whole game, so it is measured once
+        instead of on every move. move binds the dungeon it is given if this
+        has not been called.
+        
+        Args:
+            dungeon: The dungeon grid
+        """
+        self._dungeon_height = len(dungeon)
+        self._dungeon_width = len(dungeon[0]) if dungeon else 0
     
     def move(self, dx, dy, dungeon):
         """
-        Attempt to move the player in the specified direction with improved error handling.
+        Attempt to move the player in the specified direction.
         
         Args:
             dx: Change in x coordinate (-1, 0, or 1)
@@ -48,71 +80,76 @@ class Player:
         Returns:
             tuple: (moved successfully, cell content, message)
         """
-        # Safety check for dungeon integrity
-        if not dungeon or not isinstance(dungeon, list) or len(dungeon) == 0:
-            return False, None, "The dungeon seems unstable. Try again."
-            
-        try:
-            new_x = self.x + dx
-            new_y = self.y + dy
-            
-            # Check boundaries
-            if (new_x < 0 or new_x >= len(dungeon[0]) or 
-                new_y < 0 or new_y >= len(dungeon)):
-                return False, None, "You can't move outside the dungeon!"
-            
-            # Check if the destination is a wall
-            if dungeon[new_y][new_x] == '#':
-                return False, None, "You bump into a solid wall."
-            
-            # Store the content of the cell we're moving to
-            cell_content = dungeon[new_y][new_x]
-            
-            # Update position
-            self.x = new_x
-            self.y = new_y
-            
-            # Generate appropriate message based on cell content
-            message = ""
-            if cell_content == '.':
-                # Occasionally find small bonuses in empty spaces
-                if random.random() < 0.05:  # 5% chance
-                    self.score += 5
-                    message = "You found a small cache of valuables! (+5 points)"
-                else:
-                    message = "You move into an empty space."
-            elif cell_content == 'T':
-                self.take_damage(1)
-                message = random.choice(self.trap_messages)
-                # Disarm the trap after triggering it
-                dungeon[new_y][new_x] = '.'
-            elif cell_content == 'M':
-                # 10% chance to dodge monster attack
-                if random.random() < 0.1:
-                    message = "You narrowly avoid the monster's attack!"
-                else:
-                    self.take_damage(1)
-                    message = random.choice(self.monster_messages)
-                # Monster moves away after attacking
-                dungeon[new_y][new_x] = '.'
-            elif cell_content == '$':
-                self.has_treasure = True
-                self.score += 50
-                message = "You found the treasure! Now find the exit! (+50 points)"
-                # Clear the treasure from the map
-                dungeon[new_y][new_x] = '.'
-            elif cell_content == 'E':
-                if self.has_treasure:
-                    message = "You reached the exit with the treasure! Victory!"
-                else:
-                    message = "This is the exit, but you need to find the treasure first!"
-            
-            return True, cell_content, message
-            
-        except Exception as e:
-            # Fallback for any unexpected errors during movement
-            print(f"Movement error: {e}")
-            return False, None, "Something strange happens as you try to move."
+        # The dungeon is checked once when the game starts (GameEngine._new_game)
+        # and its size recorded by bind_dungeon, or here on the first move
+        if not self._dungeon_height:
+            self.bind_dungeon(dungeon)
+        new_x = self.x + dx
+        new_y = self.y + dy
+        
+        # Check boundaries
+        if not (0 <= new_y < self._dungeon_height and 0 <= new_x < self._dungeon_width):
+            return False, None, "You can't move outside the dungeon!"
+        
+        # Store the content of the cell we're moving to
+        cell_content = dungeon[new_y][new_x]
+        
+        # Check if the destination is a wall
+        if cell_content == WALL:
+            return False, None, "You bump into a solid wall."
+        
+        # Update position
+        self.x = new_x
+        self.y = new_y
+        
+        # Generate appropriate message based on cell content
+        handler = self._cell_handlers.get(cell_content)
+        message = handler(dungeon, new_x, new_y) if handler else ""
+        
+        return True, cell_content, message
+    
+    def _enter_floor(self, dungeon, x, y):
+        """Step onto an empty space, returning the event message."""
+        # Occasionally find small bonuses in empty spaces
+        if self._rng.random() < 0.05:  # 5% chance
+            self.score += 5
+            return "You found a small cache of valuables! (+5 points)"
+        return "You move into an empty space."
+    
+    def _enter_trap(self, dungeon, x, y):
+        """Step onto a trap, returning the event message."""
+        if self.health > 0:  # Same as take_damage(1), without the method call
+            self.health -= 1
+        # Disarm the trap after triggering it
+        dungeon[y][x] = FLOOR
+        return self._rng.choice(self.TRAP_MESSAGES)
+    
+    def _enter_monster(self, dungeon, x, y):
+        """Step onto a monster, returning the event message."""
+        # 10% chance to dodge monster attack
+        if self._rng.random() < 0.1:
+            message = "You narrowly avoid the monster's attack!"
+        else:
+            if self.health > 0:  # Same as take_damage(1)
+                self.health -= 1
+            message = self._rng.choice(self.MONSTER_MESSAGES)
+        # Monster moves away after attacking
+        dungeon[y][x] = FLOOR
+        return message
+    
+    def _enter_treasure(self, dungeon, x, y):
+        """Step onto the treasure, returning the event message."""
+        self.has_treasure = True
+        self.score += 50
+        # Clear the treasure from the map
+        dungeon[y][x] = FLOOR
+        return "You found the treasure! Now find the exit! (+50 points)"
+    
+    def _enter_exit(self, dungeon, x, y):
+        """Step onto the exit, returning the event message."""
+        if self.has_treasure:
+            return "You reached the exit with the treasure! Victory!"
+        return "This is the exit, but you need to find the treasure first!"
     
     def take_damage(self, amount):
         """Reduce player health by the specified amount."""
@@ -128,42 +165,78 @@ class Player:
     
     def get_visible_cells(self, dungeon):
         """
-        Calculate which cells are visible to the player with improved error handling.
+        Calculate which cells are visible to the player.
+        
+        The result only depends on the player position, the view distance and
+        the dungeon size, so it is reused until one of them changes.
         
         Args:
             dungeon: The dungeon grid
             
         Returns:
-            set: Coordinates of cells visible to the player
+            frozenset: Coordinates of cells visible to the player
         """
+        # Get dungeon dimensions
+        height = len(dungeon)
+        width = len(dungeon[0]) if height > 0 else 0
+        
+        key = (self.x, self.y, self.view_distance, width, height)
+        if key == self._visible_key:
+            return self._visible_cells
+        
         visible = set()
         
-        # Safety check
-        if not dungeon or not isinstance(dungeon, list) or len(dungeon) == 0:
-            return visible
-            
-        try:
-            # Get dungeon dimensions
-            height = len(dungeon)
-            width = len(dungeon[0]) if height > 0 else 0
-            
-            # Calculate visible area
-            for y in range(max(0, self.y - self.view_distance), 
-                           min(height, self.y + self.view_distance + 1)):
-                for x in range(max(0, self.x - self.view_distance), 
-                              min(width, self.x + self.view_distance + 1)):
-                    # Simple distance check for visibility (using Manhattan distance for speed)
-                    if abs(x - self.x) + abs(y - self.y) <= self.view_distance:
-                        visible.add((x, y))
+        # Calculate visible area. The cells within Manhattan distance on each
+        # row form one span, so no per-cell distance check is needed.
+        for dy, reach in self._view_shape():
+            y = self.y + dy
+            if 0 <= y < height:
+                visible.update(zip(range(max(0, self.x - reach), min(width, self.x + reach + 1)), repeat(y)))
+        
+        self._visible_key = key
+        self._visible_cells = frozenset(visible)
+        return self._visible_cells
+    
+    def get_visible_row_masks(self, dungeon):
+        """
+        Calculate which cells are visible to the player, as bitmasks per row.
+        
+        Covers the same cells as get_visible_cells without building a set of
+        coordinates: each row within view distance gets one contiguous span.
+        
+        Args:
+            dungeon: The dungeon grid
             
-        except Exception as e:
-            # If anything goes wrong, at least show the immediate area
-            print(f"Visibility calculation error: {e}")
-            # Fallback to just showing immediate surroundings
-            for dy in range(-1, 2):
-                for dx in range(-1, 2):
-                    nx, ny = self.x + dx, self.y + dy
-                    if 0 <= ny < len(dungeon) and 0 <= nx < len(dungeon[0]):
-                        visible.add((nx, ny))
-        
-        return visible
+        Returns:
+            list: (y, mask) pairs, bit x of mask is set if cell (x, y) is visible
+        """
+        if not dungeon:
+            return []
+        
+        height, width = len(dungeon), len(dungeon[0])
+        masks = []
+        for dy, reach in self._view_shape():
+            y = self.y + dy
+            if not 0 <= y < height:
+                continue
+            # Cells within Manhattan distance on this row
+            x0, x1 = max(0, self.x - reach), min(width - 1, self.x + reach)
+            if x0 <= x1:
+                masks.append((y, ((1 << (x1 - x0 + 1)) - 1) << x0))
+        return masks
+    
+    def _view_shape(self):
+        """
+        Get the shape of the area the player can see, relative to the player.
+        
+        The shape only depends on the view distance, so it is built once and
+        rebuilt only if the view distance changes.
+        
+        Returns:
+            list: (dy, reach) pairs, row y + dy is visible from x - reach to x + reach
+        """
+        if self._view_rows_distance != self.view_distance:
+            distance = self.view_distance
+            self._view_rows = [(dy, distance - abs(dy)) for dy in range(-distance, distance + 1)]
+            self._view_rows_distance = distance
+        return self._view_rows